@@ -10,6 +10,23 @@ from .language_utils import detect_language, format_response_for_language
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Saudi cities to look for in user messages
+SAUDI_CITIES = (
+    "Riyadh", "Jeddah", "Dammam", "Medina", "Mecca", "Al Khobar",
+    "Tabuk", "Abha", "Taif", "Yanbu", "Jubail", "Dhahran"
+)
+_CITY_NAMES = {city.lower(): city for city in SAUDI_CITIES}
+# First words of multi-word city names such as "Al Khobar"
+_CITY_PREFIXES = frozenset(name.split()[0] for name in _CITY_NAMES if " " in name)
+_WORD_RE = re.compile(r'\w+')
+
+# Flight class keywords in priority order, mapped to the stored preference
+FLIGHT_CLASS_KEYWORDS = (
+    ("business class", "business"),
+    ("first class", "first"),
+    ("economy", "economy")
+)
+
 class AgentOrchestrator:
     """
     Orchestrates the conversation flow between different specialized agents
@@ -18,7 +35,6 @@ class AgentOrchestrator:
     def __init__(self):
         """Initialize the orchestrator"""
         self.agent_system = AgentSystem()
-        self.user_preferences = {}
         logger.info("Agent Orchestrator initialized with Agent System")
     
     def process_message(self, user_message, session_id, conversation_history=None):
@@ -39,10 +55,7 @@ class AgentOrchestrator:
                 
             # Detect language
             language = detect_language(user_message)
-            logger.info(f"Processing message in {language} for session {session_id}")
-            
-            # Update user preferences based on conversation
-            self._update_preferences(user_message, conversation_history)
+            logger.info("Processing message in %s for session %s", language, session_id)
             
             # Process message with agent system
             response = self.agent_system.process_message(
@@ -51,6 +64,12 @@ class AgentOrchestrator:
                 language=language
             )
             
+            # Update this session's preferences; the orchestrator is shared by all users
+            with self.agent_system.sessions_lock:
+                session = self.agent_system.sessions.get(session_id)
+            if session is not None:
+                self._update_preferences(session.setdefault("user_preferences", {}), user_message, language)
+            
             # Format response for the detected language if needed
             if language.lower() == "arabic":
                 response_text = format_response_for_language(response["text"], language)
@@ -69,11 +88,11 @@ class AgentOrchestrator:
             else:
                 response["mock_data"] = {}
             
-            logger.info(f"Generated response for session {session_id} with intent {response['intent']}")
+            logger.info("Generated response for session %s with intent %s", session_id, response['intent'])
             return response
             
         except Exception as e:
-            logger.error(f"Error in Agent Orchestrator: {str(e)}")
+            logger.error("Error in Agent Orchestrator: %s", e)
             return {
                 "text": "I'm sorry, I encountered an error processing your request. Please try again.",
                 "language": language if 'language' in locals() else "english",
@@ -83,35 +102,29 @@ class AgentOrchestrator:
                 "mock_data": {}
             }
     
-    def _update_preferences(self, user_message, conversation_history):
+    def _update_preferences(self, preferences, user_message, language):
         """
-        Update user preferences based on conversation
+        Update a session's user preferences based on the message
         
         Args:
+            preferences (dict): The session's user preferences, updated in place
             user_message (str): Current user message
-            conversation_history (list): Previous messages
+            language (str): Language already detected for the message
         """
-        try:
-            # Track language preference
-            language = detect_language(user_message)
-            self.user_preferences["language"] = language
-            
-            # Simple keyword-based preference tracking
-            if "business class" in user_message.lower():
-                self.user_preferences["flight_class"] = "business"
-            elif "economy" in user_message.lower():
-                self.user_preferences["flight_class"] = "economy"
-            
-            # Extract destination preferences
-            destinations = self._extract_destinations(user_message)
-            if destinations:
-                self.user_preferences["destinations"] = destinations
-                
-            # Log updated preferences
-            logger.info(f"Updated user preferences: {self.user_preferences}")
-            
-        except Exception as e:
-            logger.error(f"Error updating preferences: {str(e)}")
+        # Track language preference
+        preferences["language"] = language
+        
+        # Simple keyword-based preference tracking
+        msg_lower = user_message.lower()
+        for keyword, flight_class in FLIGHT_CLASS_KEYWORDS:
+            if keyword in msg_lower:
+                preferences["flight_class"] = flight_class
+                break
+        
+        # Extract destination preferences
+        destinations = self._extract_destinations(user_message)
+        if destinations:
+            preferences["destinations"] = destinations
     
     def _extract_destinations(self, message):
         """
@@ -123,15 +136,15 @@ class AgentOrchestrator:
         Returns:
             list: Extracted destinations
         """
-        # List of Saudi cities to look for
-        saudi_cities = [
-            "Riyadh", "Jeddah", "Dammam", "Medina", "Mecca", "Al Khobar", 
-            "Tabuk", "Abha", "Taif", "Yanbu", "Jubail", "Dhahran"
-        ]
+        # Tokenize once and look words up in the city table; keep first-mention order
+        words = _WORD_RE.findall(message.lower())
+        found_destinations = {}
         
-        found_destinations = []
-        for city in saudi_cities:
-            if re.search(r'\b' + city + r'\b', message, re.IGNORECASE):
-                found_destinations.append(city)
-                
-        return found_destinations
+        for i, word in enumerate(words):
+            if word in _CITY_PREFIXES and i + 1 < len(words):
+                word = f"{word} {words[i + 1]}"
+            city = _CITY_NAMES.get(word)
+            if city:
+                found_destinations.setdefault(city)
+        
+        return list(found_destinations)
@@ -4,6 +4,9 @@ Orchestrates the different agents and manages the conversation flow
 """
 import logging
 import re
+import threading
+from functools import cached_property
+from cachetools import TTLCache
 from .conversation_lead_agent import ConversationLeadAgent
 from .flight_booking_agent import FlightBookingAgent
 from .hotel_booking_agent import HotelBookingAgent
@@ -18,15 +21,30 @@ class AgentSystem:
     
     def __init__(self):
         """Initialize the Agent System with all the specialized agents"""
+        # Every message goes through the lead agent; specialists are built on first use
         self.conversation_lead = ConversationLeadAgent()
-        self.flight_booking = FlightBookingAgent()
-        self.hotel_booking = HotelBookingAgent()
-        self.trip_planning = TripPlanningAgent()
         
-        # Session state
-        self.sessions = {}
+        # Session state; idle sessions expire so memory stays bounded. TTLCache is not
+        # thread-safe, so every access to it holds sessions_lock
+        self.sessions = TTLCache(maxsize=10000, ttl=3600)
+        self.sessions_lock = threading.Lock()
         
-        logger.info("Agent System initialized with all specialized agents")
+        logger.info("Agent System initialized")
+    
+    @cached_property
+    def flight_booking(self):
+        """Flight booking agent, created the first time a flight request arrives"""
+        return FlightBookingAgent()
+    
+    @cached_property
+    def hotel_booking(self):
+        """Hotel booking agent, created the first time a hotel request arrives"""
+        return HotelBookingAgent()
+    
+    @cached_property
+    def trip_planning(self):
+        """Trip planning agent, created the first time a trip request arrives"""
+        return TripPlanningAgent()
     
     def process_message(self, session_id, message, language="english"):
         """
@@ -41,27 +59,33 @@ class AgentSystem:
             dict: Response with text and metadata
         """
         try:
-            # Initialize session if it doesn't exist
-            if session_id not in self.sessions:
-                self.sessions[session_id] = {
-                    "conversation_history": [],
-                    "flight_options": [],
-                    "hotel_options": [],
-                    "language": language,
-                    "mock_data": {},
-                    "user_preferences": {},
-                    "current_context": None,  # Track the current conversation context
-                    "last_intent": None  # Track the last detected intent
-                }
+            # Initialize session if it doesn't exist. The local dict is used for the rest
+            # of the request, so expiry or eviction meanwhile cannot break it
+            with self.sessions_lock:
+                session = self.sessions.get(session_id)
+                if session is None:
+                    session = {
+                        "conversation_history": [],
+                        "flight_options": [],
+                        "hotel_options": [],
+                        "language": language,
+                        "mock_data": {},
+                        "user_preferences": {},
+                        "current_context": None,  # Track the current conversation context
+                        "last_intent": None  # Track the last detected intent
+                    }
+                
+                # (Re)store the session so its expiry is counted from the last message
+                self.sessions[session_id] = session
             
             # Update session language if provided
             if language:
-                self.sessions[session_id]["language"] = language
+                session["language"] = language
             else:
-                language = self.sessions[session_id]["language"]
+                language = session["language"]
             
             # Add user message to conversation history
-            self.sessions[session_id]["conversation_history"].append({
+            session["conversation_history"].append({
                 "role": "user",
                 "content": message
             })
@@ -71,7 +95,7 @@ class AgentSystem:
             raw_intent = lead_response["intent"]
             
             # Get previous intent for context awareness
-            last_intent = self.sessions[session_id].get("last_intent")
+            last_intent = session.get("last_intent")
             
             # Apply intent continuity logic for follow-up questions
             intent = self._resolve_intent_with_context(session_id, raw_intent, message, last_intent)
@@ -80,9 +104,9 @@ class AgentSystem:
             
             # Process based on intent
             if intent == "flight_booking":
-                response = self._handle_flight_booking(session_id, message, language)
+                response = self._handle_flight_booking(session, session_id, message, language)
             elif intent == "hotel_booking":
-                response = self._handle_hotel_booking(session_id, message, language)
+                response = self._handle_hotel_booking(session, session_id, message, language)
             elif intent == "trip_planning":
                 response = self._handle_trip_planning(session_id, message, language)
             else:
@@ -95,10 +119,10 @@ class AgentSystem:
                 }
             
             # Update last intent
-            self.sessions[session_id]["last_intent"] = intent
+            session["last_intent"] = intent
             
             # Add assistant response to conversation history
-            self.sessions[session_id]["conversation_history"].append({
+            session["conversation_history"].append({
                 "role": "assistant",
                 "content": response["text"]
             })
@@ -114,11 +138,12 @@ class AgentSystem:
                 "mock_data": {}
             }
     
-    def _handle_flight_booking(self, session_id, message, language):
+    def _handle_flight_booking(self, session, session_id, message, language):
         """
         Handle flight booking intent
         
         Args:
+            session (dict): Session state for this request
             session_id (str): Session identifier
             message (str): User message
             language (str): Language of the conversation
@@ -126,34 +151,25 @@ class AgentSystem:
         Returns:
             dict: Response with flight options
         """
-        try:
-            # Process request with flight booking agent
-            response = self.flight_booking.process_request(
-                session_id=session_id,
-                message=message,
-                language=language
-            )
-            
-            # Store flight options in session
-            if "mock_data" in response and "flight_options" in response["mock_data"]:
-                self.sessions[session_id]["flight_options"] = response["mock_data"]["flight_options"]
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error handling flight booking: {str(e)}")
-            return {
-                "text": "I'm sorry, I encountered an error processing your flight booking request.",
-                "intent": "error",
-                "success": False,
-                "mock_data": {}
-            }
+        # Process request with flight booking agent
+        response = self.flight_booking.process_request(
+            session_id=session_id,
+            message=message,
+            language=language
+        )
+        
+        # Store flight options in session
+        if "mock_data" in response and "flight_options" in response["mock_data"]:
+            session["flight_options"] = response["mock_data"]["flight_options"]
+        
+        return response
     
-    def _handle_hotel_booking(self, session_id, message, language):
+    def _handle_hotel_booking(self, session, session_id, message, language):
         """
         Handle hotel booking intent
         
         Args:
+            session (dict): Session state for this request
             session_id (str): Session identifier
             message (str): User message
             language (str): Language of the conversation
@@ -161,28 +177,18 @@ class AgentSystem:
         Returns:
             dict: Response with hotel options
         """
-        try:
-            # Process request with hotel booking agent
-            response = self.hotel_booking.process_request(
-                session_id=session_id,
-                message=message,
-                language=language
-            )
-            
-            # Store hotel options in session
-            if "mock_data" in response and "hotel_options" in response["mock_data"]:
-                self.sessions[session_id]["hotel_options"] = response["mock_data"]["hotel_options"]
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error handling hotel booking: {str(e)}")
-            return {
-                "text": "I'm sorry, I encountered an error processing your hotel booking request.",
-                "intent": "error",
-                "success": False,
-                "mock_data": {}
-            }
+        # Process request with hotel booking agent
+        response = self.hotel_booking.process_request(
+            session_id=session_id,
+            message=message,
+            language=language
+        )
+        
+        # Store hotel options in session
+        if "mock_data" in response and "hotel_options" in response["mock_data"]:
+            session["hotel_options"] = response["mock_data"]["hotel_options"]
+        
+        return response
     
     def _handle_trip_planning(self, session_id, message, language):
         """
@@ -196,31 +202,21 @@ class AgentSystem:
         Returns:
             dict: Response with trip plan
         """
-        try:
-            # Process request with trip planning agent
-            response = self.trip_planning.process_request(
-                session_id=session_id,
-                message=message,
-                language=language
-            )
-            
-            # Ensure the response has the correct format
-            return {
-                "text": response.get("text", ""),
-                "intent": "trip_planning",
-                "success": response.get("success", True),
-                "mock_data": response.get("mock_data", {})
-            }
-            
-        except Exception as e:
-            logger.error(f"Error handling trip planning: {str(e)}")
-            return {
-                "text": "I'm sorry, I encountered an error processing your trip planning request.",
-                "intent": "trip_planning",
-                "success": False,
-                "mock_data": {}
-            }
-            
+        # Process request with trip planning agent
+        response = self.trip_planning.process_request(
+            session_id=session_id,
+            message=message,
+            language=language
+        )
+        
+        # Ensure the response has the correct format
+        return {
+            "text": response.get("text", ""),
+            "intent": "trip_planning",
+            "success": response.get("success", True),
+            "mock_data": response.get("mock_data", {})
+        }
+    
     def _resolve_intent_with_context(self, session_id, raw_intent, message, last_intent):
         """
         Resolve the final intent by considering conversation context and continuity
@@ -234,9 +230,6 @@ class AgentSystem:
         Returns:
             str: Resolved intent considering context
         """
-        # Extract conversation history for context
-        history = self.sessions[session_id]["conversation_history"]
-        
         # If message is explicitly about a new topic, use the new raw intent
         topic_change_indicators = [
             "now I need", "let's talk about", "I want to", "can you help me with", 
@@ -278,9 +271,11 @@ class AgentSystem:
         Args:
             session_id (str): Session identifier
         """
-        if session_id in self.sessions:
-            self.sessions[session_id]["conversation_history"] = []
-            self.sessions[session_id]["flight_options"] = []
-            self.sessions[session_id]["hotel_options"] = []
-            self.sessions[session_id]["mock_data"] = {}
-            self.sessions[session_id]["user_preferences"] = {}
+        with self.sessions_lock:
+            session = self.sessions.get(session_id)
+        if session is not None:
+            session["conversation_history"] = []
+            session["flight_options"] = []
+            session["hotel_options"] = []
+            session["mock_data"] = {}
+            session["user_preferences"] = {}
@@ -1,5 +1,4 @@
 import os
-import json
 import logging
 import re
 from typing import Dict, Any, List, Optional
@@ -3,13 +3,15 @@ Flight Booking Agent for Trip Planning Assistant
 Generates fictional but realistic flight options
 """
 import logging
-import json
+import re
 import random
+from collections import namedtuple
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
 # Import LangGraph utilities
 from agents.llm_utils import create_agent_node
+from agents.mock_data_store import MockDataStore
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -37,22 +39,33 @@ Important guidelines:
 Format the response in a clean, organized way that's easy for users to compare options.
 """
 
+Airline = namedtuple("Airline", "name code base_price")
+Airport = namedtuple("Airport", "city code name")
+
 # Saudi airlines
-AIRLINES = [
-    {"name": "Saudia", "code": "SV", "base_price": 800},
-    {"name": "flynas", "code": "XY", "base_price": 600},
-    {"name": "flyadeal", "code": "F3", "base_price": 500}
-]
+AIRLINES = (
+    Airline("Saudia", "SV", 800),
+    Airline("flynas", "XY", 600),
+    Airline("flyadeal", "F3", 500)
+)
 
 # Saudi cities and airports
-SAUDI_AIRPORTS = [
-    {"city": "Riyadh", "code": "RUH", "name": "King Khalid International Airport"},
-    {"city": "Jeddah", "code": "JED", "name": "King Abdulaziz International Airport"},
-    {"city": "Dammam", "code": "DMM", "name": "King Fahd International Airport"},
-    {"city": "Medina", "code": "MED", "name": "Prince Mohammad Bin Abdulaziz International Airport"},
-    {"city": "Abha", "code": "AHB", "name": "Abha International Airport"},
-    {"city": "Tabuk", "code": "TUU", "name": "Tabuk Regional Airport"}
-]
+SAUDI_AIRPORTS = (
+    Airport("Riyadh", "RUH", "King Khalid International Airport"),
+    Airport("Jeddah", "JED", "King Abdulaziz International Airport"),
+    Airport("Dammam", "DMM", "King Fahd International Airport"),
+    Airport("Medina", "MED", "Prince Mohammad Bin Abdulaziz International Airport"),
+    Airport("Abha", "AHB", "Abha International Airport"),
+    Airport("Tabuk", "TUU", "Tabuk Regional Airport")
+)
+
+# Airport lookups by lowercase city name and by IATA code
+AIRPORT_BY_CITY = {airport.city.lower(): airport for airport in SAUDI_AIRPORTS}
+AIRPORT_BY_CODE = {airport.code: airport for airport in SAUDI_AIRPORTS}
+
+# Message patterns; "to" must be a whole word so city names like "Toronto" are not split
+_TO_RE = re.compile(r"\bto\b")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
 
 class FlightBookingAgent:
     """Specialized agent for handling flight booking requests
@@ -60,7 +73,7 @@ class FlightBookingAgent:
     
     def __init__(self):
         """Initialize the flight booking agent"""
-        self.mock_data = {}  # Store mock data for the current session
+        self.mock_data = MockDataStore("flight")  # Latest mock data per session
         logger.info("Flight Booking Agent initialized with LangGraph integration")
         
     def process_request(self, session_id, message, language):
@@ -86,7 +99,7 @@ class FlightBookingAgent:
             mock_data = {"flights": mock_flights}
             
             # Store mock data for this session
-            self.mock_data[session_id] = mock_data
+            self.mock_data.set(session_id, mock_data)
             
             # Format response based on language
             response_text = self._format_flight_response(mock_data, flight_info, language)
@@ -130,18 +143,17 @@ class FlightBookingAgent:
             }
             
             # Basic flight information extraction
-            # Look for common keywords
-            if "to" in message.lower():
-                parts = message.lower().split("to")
-                if len(parts) > 1:
-                    destination_part = parts[1].strip()
-                    # Extract the first word after "to" as destination
-                    destination_words = destination_part.split()
-                    if destination_words:
-                        # Extract destination and remove punctuation
-                        dest = destination_words[0].rstrip(',.')
-                        if dest:
-                            flight_info['destination'] = dest
+            # Split around the word "to"
+            parts = _TO_RE.split(message.lower())
+            if len(parts) > 1:
+                destination_part = parts[1].strip()
+                # Extract the first word after "to" as destination
+                destination_words = destination_part.split()
+                if destination_words:
+                    # Extract destination and remove punctuation
+                    dest = destination_words[0].rstrip(',.')
+                    if dest:
+                        flight_info['destination'] = dest
                 
                 # Look for origin city before "to"
                 origin_words = parts[0].split()
@@ -155,9 +167,7 @@ class FlightBookingAgent:
                         flight_info['origin'] = origin_words[-2].strip()
             
             # Look for dates in format YYYY-MM-DD
-            import re
-            date_pattern = r"\d{4}-\d{2}-\d{2}"
-            dates = re.findall(date_pattern, message)
+            dates = _DATE_RE.findall(message)
             if dates:
                 flight_info['departure_date'] = dates[0]
                 if len(dates) > 1:
@@ -227,25 +237,25 @@ class FlightBookingAgent:
                 flight['amenities'] = ["Wi-Fi", "Entertainment"]
         
         if language.lower() == 'arabic':
-            response = f"وجدت {len(flights)} خيارات رحلات من {origin} إلى {destination} ليوم {date}:\n\n"
+            parts = [f"وجدت {len(flights)} خيارات رحلات من {origin} إلى {destination} ليوم {date}:\n\n"]
             
             for i, flight in enumerate(flights, 1):
-                response += f"{i}. {flight.get('airline')} {flight.get('flight_number')} - {flight.get('departure_time')} إلى {flight.get('arrival_time')}\n"
-                response += f"   السعر: {flight.get('price')} {flight.get('currency')} ({flight.get('class')})\n"
-                response += f"   المدة: {flight.get('duration')} | المرافق: {', '.join(flight.get('amenities', []))}\n\n"
+                parts.append(f"{i}. {flight.get('airline')} {flight.get('flight_number')} - {flight.get('departure_time')} إلى {flight.get('arrival_time')}\n")
+                parts.append(f"   السعر: {flight.get('price')} {flight.get('currency')} ({flight.get('class')})\n")
+                parts.append(f"   المدة: {flight.get('duration')} | المرافق: {', '.join(flight.get('amenities', []))}\n\n")
             
-            response += "هل ترغب في المتابعة مع حجز أي من هذه الخيارات؟"
+            parts.append("هل ترغب في المتابعة مع حجز أي من هذه الخيارات؟")
         else:
-            response = f"I found {len(flights)} flight options from {origin} to {destination} for {date}:\n\n"
+            parts = [f"I found {len(flights)} flight options from {origin} to {destination} for {date}:\n\n"]
             
             for i, flight in enumerate(flights, 1):
-                response += f"{i}. {flight.get('airline')} {flight.get('flight_number')} - {flight.get('departure_time')} to {flight.get('arrival_time')}\n"
-                response += f"   Price: {flight.get('price')} {flight.get('currency')} ({flight.get('class')})\n"
-                response += f"   Duration: {flight.get('duration')} | Amenities: {', '.join(flight.get('amenities', []))}\n\n"
+                parts.append(f"{i}. {flight.get('airline')} {flight.get('flight_number')} - {flight.get('departure_time')} to {flight.get('arrival_time')}\n")
+                parts.append(f"   Price: {flight.get('price')} {flight.get('currency')} ({flight.get('class')})\n")
+                parts.append(f"   Duration: {flight.get('duration')} | Amenities: {', '.join(flight.get('amenities', []))}\n\n")
             
-            response += "Would you like to proceed with booking any of these options?"
+            parts.append("Would you like to proceed with booking any of these options?")
         
-        return response
+        return "".join(parts)
     
     def _generate_mock_flight_options(self, flight_info):
         """
@@ -263,18 +273,18 @@ class FlightBookingAgent:
             mock_flight_options = []
             
             for airline in AIRLINES:
-                flight_number = f"{airline['code']} {random.randint(100, 999)}"
+                flight_number = f"{airline.code} {random.randint(100, 999)}"
                 departure_time = f"{flight_info['departure_date']} {random.randint(0, 23):02d}:{random.randint(0, 59):02d}"
                 arrival_time = f"{flight_info['departure_date']} {random.randint(0, 23):02d}:{random.randint(0, 59):02d}"
                 duration = f"{random.randint(1, 5)} hours {random.randint(0, 59)} minutes"
-                price = airline['base_price'] + random.randint(-100, 100)
+                price = airline.base_price + random.randint(-100, 100)
                 seat_options = {
                     "economy": random.randint(10, 50),
                     "business": random.randint(5, 20)
                 }
                 
                 mock_flight_options.append({
-                    "airline": airline['name'],
+                    "airline": airline.name,
                     "flight_number": flight_number,
                     "departure_time": departure_time,
                     "arrival_time": arrival_time,
@@ -0,0 +1,25 @@
+"""
+Conversation History Utilities for Trip Planning Assistant
+Renders conversation history for agent prompts
+"""
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Speaker labels used when rendering history; anything but the user is the AI
+_HISTORY_ROLES = {"user": "Human"}
+
+def format_conversation_history(history):
+    """
+    Format conversation history for the prompt
+    
+    Args:
+        history (list): List of message dictionaries
+        
+    Returns:
+        str: Formatted conversation history
+    """
+    return "".join(
+        f"{_HISTORY_ROLES.get(msg['role'], 'AI')}: {msg['content']}\n" for msg in history
+    )
@@ -3,7 +3,7 @@ Hotel Booking Agent for Trip Planning Assistant
 Generates fictional but realistic hotel options
 """
 import logging
-import json
+import re
 import random
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
@@ -35,6 +35,13 @@ Important guidelines:
 Format the response in a clean, organized way that's easy for users to compare options.
 """
 
+# Message patterns; "in" must be a whole word so "find" or "Medina" are not split
+_CITY_RE = re.compile(r"\b(?:Riyadh|Jeddah|Dammam|Medina|Mecca|Al Khobar|Tabuk|Abha|Taif|Yanbu)\b", re.IGNORECASE)
+_IN_RE = re.compile(r"\bin\b")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_NIGHTS_RE = re.compile(r"\b(1|2|3|4|5|6|7|8|9|10)\s+nights?\b", re.IGNORECASE)
+_GUEST_RE = re.compile(r"\b(?:1|2|3|4|5|6|7|8|9)\b\s*(?:guest|people|person)s?", re.IGNORECASE)
+
 class HotelBookingAgent:
     """
     Specialized agent for handling hotel booking requests
@@ -101,9 +108,6 @@ class HotelBookingAgent:
             dict: Extracted hotel information with default values for missing fields
         """
         try:
-            # Initialize with sensible defaults
-            from datetime import datetime, timedelta
-            
             # Default values for a basic hotel search
             check_in_date = datetime.now() + timedelta(days=7)  # Default to one week from today
             check_out_date = check_in_date + timedelta(days=3)  # Default to 3-night stay
@@ -116,16 +120,13 @@ class HotelBookingAgent:
                 'price_per_night': 500  # Default price
             }
             
-            # Look for destination
-            import re
             # Look for city names (improved pattern matching needed)
-            city_pattern = r"\b(?:Riyadh|Jeddah|Dammam|Medina|Mecca|Al Khobar|Tabuk|Abha|Taif|Yanbu)\b"
-            cities = re.findall(city_pattern, message, re.IGNORECASE)
+            cities = _CITY_RE.findall(message)
             if cities:
                 hotel_info['destination'] = cities[0].title()  # Capitalize city name
-            elif "hotel" in message.lower() and "in" in message.lower():
+            elif "hotel" in message.lower() and _IN_RE.search(message.lower()):
                 # Try to extract destination from "hotel in [location]" pattern
-                parts = message.lower().split("in")
+                parts = _IN_RE.split(message.lower())
                 if len(parts) > 1 and len(parts[1].strip()) > 0:
                     # Take the first word after "in" as potential destination
                     location_words = parts[1].strip().split()
@@ -135,8 +136,7 @@ class HotelBookingAgent:
                             hotel_info['destination'] = potential_destination.title()
             
             # Look for dates (YYYY-MM-DD format)
-            date_pattern = r"\d{4}-\d{2}-\d{2}"
-            dates = re.findall(date_pattern, message)
+            dates = _DATE_RE.findall(message)
             if dates:
                 hotel_info['check_in'] = dates[0]
                 if len(dates) > 1:
@@ -148,19 +148,16 @@ class HotelBookingAgent:
                 hotel_info['check_out'] = (datetime.now() + timedelta(days=10)).strftime("%Y-%m-%d")
             
             # Extract number of nights
-            nights_pattern = r"\b(?:1|2|3|4|5|6|7|8|9|10)\s+nights?\b"
-            nights_match = re.search(nights_pattern, message, re.IGNORECASE)
+            nights_match = _NIGHTS_RE.search(message)
             if nights_match:
-                nights_text = nights_match.group(0)
-                num_nights = int(re.search(r"\d+", nights_text).group(0))
+                num_nights = int(nights_match.group(1))
                 # Update check_out based on check_in and number of nights
                 check_in = datetime.strptime(hotel_info['check_in'], "%Y-%m-%d")
                 check_out = check_in + timedelta(days=num_nights)
                 hotel_info['check_out'] = check_out.strftime("%Y-%m-%d")
             
             # Look for number of guests
-            guest_pattern = r"\b(?:1|2|3|4|5|6|7|8|9)\b\s*(?:guest|people|person)s?"
-            guest_match = re.search(guest_pattern, message, re.IGNORECASE)
+            guest_match = _GUEST_RE.search(message)
             if guest_match:
                 hotel_info['guests'] = int(guest_match.group(0).split()[0])
             
@@ -175,7 +172,6 @@ class HotelBookingAgent:
         except Exception as e:
             logger.error(f"Error extracting hotel info: {str(e)}")
             # Return default values on error
-            from datetime import datetime, timedelta
             check_in_date = datetime.now() + timedelta(days=7)
             check_out_date = check_in_date + timedelta(days=3)
             
@@ -232,25 +228,25 @@ class HotelBookingAgent:
                 hotel['stars'] = hotel['star_rating']
         
         if language.lower() == 'arabic':
-            response = f"وجدت {len(hotels)} خيارات فنادق في {city} من {check_in} إلى {check_out}:\n\n"
+            parts = [f"وجدت {len(hotels)} خيارات فنادق في {city} من {check_in} إلى {check_out}:\n\n"]
             
             for i, hotel in enumerate(hotels, 1):
-                response += f"{i}. {hotel.get('name')} - {hotel.get('star_rating')} نجوم\n"
-                response += f"   السعر: {hotel.get('price_per_night')} {hotel.get('currency')} في الليلة\n"
-                response += f"   المرافق: {', '.join(hotel.get('amenities', []))}\n\n"
+                parts.append(f"{i}. {hotel.get('name')} - {hotel.get('star_rating')} نجوم\n")
+                parts.append(f"   السعر: {hotel.get('price_per_night')} {hotel.get('currency')} في الليلة\n")
+                parts.append(f"   المرافق: {', '.join(hotel.get('amenities', []))}\n\n")
             
-            response += "هل ترغب في المتابعة مع حجز أي من هذه الخيارات؟"
+            parts.append("هل ترغب في المتابعة مع حجز أي من هذه الخيارات؟")
         else:
-            response = f"I found {len(hotels)} hotel options in {city} from {check_in} to {check_out}:\n\n"
+            parts = [f"I found {len(hotels)} hotel options in {city} from {check_in} to {check_out}:\n\n"]
             
             for i, hotel in enumerate(hotels, 1):
-                response += f"{i}. {hotel.get('name')} - {hotel.get('star_rating')} stars\n"
-                response += f"   Price: {hotel.get('price_per_night')} {hotel.get('currency')} per night\n"
-                response += f"   Amenities: {', '.join(hotel.get('amenities', []))}\n\n"
+                parts.append(f"{i}. {hotel.get('name')} - {hotel.get('star_rating')} stars\n")
+                parts.append(f"   Price: {hotel.get('price_per_night')} {hotel.get('currency')} per night\n")
+                parts.append(f"   Amenities: {', '.join(hotel.get('amenities', []))}\n\n")
             
-            response += "Would you like to proceed with booking any of these options?"
+            parts.append("Would you like to proceed with booking any of these options?")
         
-        return response
+        return "".join(parts)
     
     def _generate_mock_hotel_options(self, hotel_info):
         """
@@ -5,10 +5,11 @@ Implements LangChain integration with DeepSeek LLM
 import os
 from dotenv import load_dotenv
 import logging
+from functools import lru_cache
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationBufferWindowMemory
 from langchain_core.runnables import RunnablePassthrough
 
 # Configure logging
@@ -26,10 +27,21 @@ if not DEEPSEEK_API_KEY:
 # DeepSeek API base URL
 DEEPSEEK_API_BASE = "https://api.deepseek.com"
 
+# Per-request timeout in seconds, and retries with backoff for transient DeepSeek errors
+LLM_TIMEOUT = 30.0
+LLM_MAX_RETRIES = 3
+
+# Number of recent exchanges kept in conversation memory, bounding prompt size
+MEMORY_WINDOW_TURNS = 6
+
+@lru_cache(maxsize=8)
 def get_llm(temperature=0.7, model="deepseek-chat"):
     """
     Initialize and return a ChatOpenAI model configured for DeepSeek
     
+    One model is kept per (temperature, model) pair so chains built from it
+    share a single HTTP connection pool.
+    
     Args:
         temperature (float): Controls randomness in responses (0.0 to 1.0)
         model (str): Model identifier for DeepSeek
@@ -42,13 +54,51 @@ def get_llm(temperature=0.7, model="deepseek-chat"):
             model=model,
             temperature=temperature,
             api_key=DEEPSEEK_API_KEY,
-            base_url=DEEPSEEK_API_BASE
+            base_url=DEEPSEEK_API_BASE,
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES
         )
         return llm
     except Exception as e:
         logger.error(f"Error initializing LLM: {str(e)}")
         raise
 
+@lru_cache(maxsize=16)
+def get_basic_prompt(system_prompt):
+    """
+    Build the prompt template for a basic chain
+    
+    Templates are cached per system prompt so every chain for an agent reuses
+    one object and sends the same system prefix on each call.
+    
+    Args:
+        system_prompt (str): System prompt for the LLM
+        
+    Returns:
+        ChatPromptTemplate: Prompt template
+    """
+    return ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("human", "{input}")
+    ])
+
+@lru_cache(maxsize=16)
+def get_conversation_prompt(system_prompt):
+    """
+    Build the prompt template for a conversation chain, cached per system prompt
+    
+    Args:
+        system_prompt (str): System prompt for the LLM
+        
+    Returns:
+        ChatPromptTemplate: Prompt template with a chat history placeholder
+    """
+    return ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("placeholder", "{chat_history}"),
+        ("human", "{input}")
+    ])
+
 def create_basic_chain(system_prompt):
     """
     Create a basic LangChain chain with a system prompt
@@ -63,11 +113,8 @@ def create_basic_chain(system_prompt):
         # Initialize LLM
         llm = get_llm()
         
-        # Create prompt template
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("human", "{input}")
-        ])
+        # Get the shared prompt template
+        prompt = get_basic_prompt(system_prompt)
         
         # Create chain
         chain = prompt | llm | StrOutputParser()
@@ -81,6 +128,9 @@ def create_conversation_chain(system_prompt):
     """
     Create a LangChain chain with conversation memory
     
+    Only the last MEMORY_WINDOW_TURNS exchanges are replayed into the prompt,
+    so prompt size stays constant as the conversation grows.
+    
     Args:
         system_prompt (str): System prompt for the LLM
         
@@ -91,19 +141,16 @@ def create_conversation_chain(system_prompt):
         # Initialize LLM
         llm = get_llm()
         
-        # Initialize conversation memory
-        memory = ConversationBufferMemory(
+        # Initialize windowed conversation memory
+        memory = ConversationBufferWindowMemory(
+            k=MEMORY_WINDOW_TURNS,
             return_messages=True,
             memory_key="chat_history",
             input_key="input"
         )
         
-        # Create prompt template with memory
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("placeholder", "{chat_history}"),
-            ("human", "{input}")
-        ])
+        # Get the shared prompt template with memory
+        prompt = get_conversation_prompt(system_prompt)
         
         # Create chain with memory
         chain = (
@@ -126,7 +173,7 @@ def run_chain_with_memory(chain, memory, user_input):
     
     Args:
         chain: LangChain chain
-        memory: ConversationBufferMemory object
+        memory: ConversationBufferWindowMemory object
         user_input (str): User message
         
     Returns:
@@ -4,30 +4,55 @@ Handles language detection and related functionality
 """
 import re
 import logging
+from functools import lru_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Arabic character range in Unicode
-ARABIC_UNICODE_RANGE = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]+')
+# Arabic character ranges in Unicode; search stops at the first Arabic character
+ARABIC_UNICODE_RANGE = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]')
+
+# Longer texts (documents, LLM output) are scanned directly instead of being kept as cache keys
+MAX_CACHED_TEXT_LENGTH = 4096
 
 def detect_language(text):
     """
     Detect if text is in Arabic or English
     
+    Results for chat-sized messages are memoized, so repeated messages
+    (greetings, yes/no) are free.
+    
     Args:
         text (str): Text to analyze
         
     Returns:
         str: 'ar' for Arabic, 'en' for English
     """
-    # Check if text contains Arabic characters
-    if ARABIC_UNICODE_RANGE.search(text):
-        logger.info("Detected Arabic text")
-        return 'ar'
-    else:
-        logger.info("Detected English text (or non-Arabic)")
+    if len(text) > MAX_CACHED_TEXT_LENGTH:
+        return _scan_language(text)
+    return _detect_language_cached(text)
+
+@lru_cache(maxsize=1024)
+def _detect_language_cached(text):
+    """Memoized language scan for chat-sized messages"""
+    return _scan_language(text)
+
+def _scan_language(text):
+    """
+    Scan text for Arabic characters
+    
+    Args:
+        text (str): Text to analyze
+        
+    Returns:
+        str: 'ar' for Arabic, 'en' for English
+    """
+    # Pure ASCII text cannot contain Arabic; isascii() is a single C-level check
+    if text.isascii():
         return 'en'
+    
+    # Check if text contains Arabic characters
+    return 'ar' if ARABIC_UNICODE_RANGE.search(text) else 'en'
 
 def get_direction(language):
     """
@@ -0,0 +1,180 @@
+"""
+LLM Response Cache for Trip Planning Assistant
+In-process LRU cache for deterministic LLM completions, shared through Redis when configured
+"""
+import time
+import hashlib
+import logging
+import threading
+import orjson
+from collections import OrderedDict
+from .mock_data_store import get_redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry expiry
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize (int): Maximum number of cached responses
+            ttl (int): Seconds before a cached response expires
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(model, messages, temperature, max_tokens=None, json_mode=False):
+        """
+        Build a stable cache key for an LLM request
+
+        Args:
+            model (str): Model name
+            messages (list): Chat messages sent to the model
+            temperature (float): Sampling temperature
+            max_tokens (int, optional): Cap on generated tokens
+            json_mode (bool): Whether the request asked for a JSON object
+
+        Returns:
+            str: SHA256 hex digest identifying the request
+        """
+        payload = orjson.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "json_mode": json_mode
+            },
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key):
+        """
+        Get a cached value
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Any: Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Store a value, evicting the least recently used entry when full
+
+        Args:
+            key (str): Cache key
+            value (Any): Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached values"""
+        with self._lock:
+            self._entries.clear()
+
+class RedisLLMCache:
+    """
+    LLM response cache stored in Redis so every worker process shares hits
+
+    Offers the same interface as LLMCache; values must be JSON-serializable.
+    """
+
+    def __init__(self, redis_client, namespace, ttl=3600):
+        """
+        Initialize the cache
+
+        Args:
+            redis_client (redis.Redis): Connected Redis client
+            namespace (str): Key prefix separating caches, e.g. "llm:response"
+            ttl (int): Seconds before a cached response expires
+        """
+        self.ttl = ttl
+        self.namespace = namespace
+        self._redis = redis_client
+
+    cache_key = staticmethod(LLMCache.cache_key)
+
+    def _key(self, key):
+        """Build the Redis key for a cache key"""
+        return f"{self.namespace}:{key}"
+
+    def get(self, key):
+        """
+        Get a cached value
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Any: Cached value, or None if missing, expired or Redis is unreachable
+        """
+        try:
+            raw = self._redis.get(self._key(key))
+            return orjson.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.error(f"Error reading LLM cache from Redis: {str(e)}")
+            return None
+
+    def set(self, key, value):
+        """
+        Store a value with the cache ttl
+
+        Args:
+            key (str): Cache key
+            value (Any): Value to cache
+        """
+        try:
+            self._redis.set(self._key(key), orjson.dumps(value), ex=self.ttl)
+        except Exception as e:
+            logger.error(f"Error writing LLM cache to Redis: {str(e)}")
+
+    def clear(self):
+        """Remove all cached values in this namespace"""
+        for redis_key in self._redis.scan_iter(match=self._key("*")):
+            self._redis.delete(redis_key)
+
+def create_llm_cache(namespace, maxsize=1024, ttl=3600):
+    """
+    Create an LLM cache, backed by Redis when REDIS_URL is configured
+
+    Args:
+        namespace (str): Redis key prefix for this cache
+        maxsize (int): Maximum entries for the in-process fallback
+        ttl (int): Seconds before a cached response expires
+
+    Returns:
+        LLMCache or RedisLLMCache: Cache with get/set/clear
+    """
+    redis_client = get_redis_client()
+    if redis_client is not None:
+        return RedisLLMCache(redis_client, namespace, ttl=ttl)
+    return LLMCache(maxsize=maxsize, ttl=ttl)
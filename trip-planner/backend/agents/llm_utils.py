@@ -4,8 +4,14 @@ Handles connection to DeepSeek LLM via OpenAI compatibility layer
 Uses LangGraph for agent orchestration
 """
 import os
+import copy
 import json
+import time
 import logging
+import threading
+import httpx
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 from dotenv import load_dotenv
 from typing import Dict, List, Any, Optional, Callable
@@ -16,6 +22,7 @@ from langgraph.graph import StateGraph
 START = "__start__"
 END = "__end__"
 from typing_extensions import TypedDict, NotRequired
+from .llm_cache import LLMCache, create_llm_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -32,9 +39,74 @@ if not DEEPSEEK_API_KEY:
 # DeepSeek API base URL - note the correct base URL without v1
 DEEPSEEK_API_BASE = "https://api.deepseek.com"
 
+# Set DEEPSEEK_PREWARM=0 to skip opening a DeepSeek connection at startup
+DEEPSEEK_PREWARM = os.getenv("DEEPSEEK_PREWARM", "1") != "0"
+
+# Cache for deterministic (temperature 0) completions
+response_cache = create_llm_cache("llm:response", maxsize=1024, ttl=3600)
+
+# Cache for generated flight and hotel options, keyed on the request arguments
+options_cache = create_llm_cache("llm:options", maxsize=1024, ttl=86400)
+
+# Airport codes and alternate spellings mapped to one city name, so equivalent
+# requests ("RUH" / "riyadh" / "Riyadh") share an options cache entry
+CITY_ALIASES = {
+    "ruh": "Riyadh",
+    "jed": "Jeddah",
+    "dmm": "Dammam",
+    "med": "Medina",
+    "madinah": "Medina",
+    "makkah": "Mecca",
+    "ahb": "Abha",
+    "tuu": "Tabuk",
+    "khobar": "Al Khobar",
+    "al-khobar": "Al Khobar",
+    "الرياض": "Riyadh",
+    "جدة": "Jeddah",
+    "الدمام": "Dammam",
+    "المدينة": "Medina",
+    "مكة": "Mecca",
+    "أبها": "Abha",
+    "تبوك": "Tabuk"
+}
+
+# Cap on DeepSeek requests in flight from this process; extra callers queue for a slot
+MAX_CONCURRENT_LLM_CALLS = 8
+llm_call_slots = threading.BoundedSemaphore(MAX_CONCURRENT_LLM_CALLS)
+
+# Shared threads for independent DeepSeek calls made on behalf of one request
+# (e.g. outbound and return flights); they wait on sockets with the GIL released
+llm_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_LLM_CALLS, thread_name_prefix="llm")
+
+# Connection pool limits for the DeepSeek client; idle connections are kept for a minute
+# (httpx drops them after 5s by default) so gaps between chat turns skip the TLS handshake
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+# Retries for transient DeepSeek failures (connection errors, timeouts, 408/409/429/5xx);
+# the OpenAI SDK waits with jittered exponential backoff between attempts
+LLM_MAX_RETRIES = 3
+
+# Output token budget per generated option; option replies are bounded JSON, so a tight
+# max_tokens stops DeepSeek from running on (output tokens dominate its latency)
+FLIGHT_OPTION_MAX_TOKENS = 350
+HOTEL_OPTION_MAX_TOKENS = 400
+
+# Last known DeepSeek status for /health, refreshed in the background once it is
+# older than LLM_STATUS_TTL seconds; None until the first probe has finished
+LLM_STATUS_TTL = 30
+LLM_STATUS_PROBE_TIMEOUT = 5
+_llm_status = None
+_llm_status_checked_at = None
+_llm_status_refreshing = False
+_llm_status_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
 def init_openai_client():
     """
-    Initialize and return an OpenAI client configured for DeepSeek
+    Initialize and return the shared OpenAI client configured for DeepSeek
+    
+    The client is created once per process so its connection pool (and the
+    TLS session to DeepSeek) is reused across calls.
     
     Returns:
         OpenAI: Configured OpenAI client for DeepSeek
@@ -43,14 +115,128 @@ def init_openai_client():
         # Configure OpenAI client with DeepSeek settings
         client = OpenAI(
             api_key=DEEPSEEK_API_KEY,
-            base_url=DEEPSEEK_API_BASE
+            base_url=DEEPSEEK_API_BASE,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=httpx.Client(limits=LLM_HTTP_LIMITS, timeout=30.0)
         )
         return client
     except Exception as e:
         logger.error(f"Error initializing OpenAI client: {str(e)}")
         raise
 
-def generate_response(system_prompt, user_message, conversation_history=None, temperature=0.7, model="deepseek-chat"):
+def prewarm_connection():
+    """
+    Open a keep-alive connection to DeepSeek ahead of the first real request
+    
+    Failures are only logged; the first request will simply connect itself.
+    """
+    if not DEEPSEEK_PREWARM:
+        return
+    
+    try:
+        init_openai_client().with_options(timeout=5).models.list()
+        logger.info("DeepSeek connection pre-warmed")
+    except Exception as e:
+        logger.warning(f"Could not pre-warm DeepSeek connection: {str(e)}")
+
+# Stdlib decoder used only for raw_decode, which stops at the end of the first JSON value
+_JSON_DECODER = json.JSONDecoder()
+
+def extract_json_object(text):
+    """
+    Extract the first JSON object embedded in an LLM response
+    
+    Decodes from each "{" in turn with a single C-level pass that stops where
+    the object ends, so prose or stray braces after the JSON are ignored.
+    
+    Args:
+        text (str): Response text that may contain a JSON object
+        
+    Returns:
+        dict: The first decodable JSON object, or None if there is none
+    """
+    start = text.find('{')
+    while start >= 0:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(obj, dict):
+                return obj
+        except json.JSONDecodeError:
+            pass
+        start = text.find('{', start + 1)
+    return None
+
+def _completion_options(max_tokens=None, json_mode=False):
+    """
+    Build the optional chat completion arguments
+    
+    Args:
+        max_tokens (int, optional): Cap on generated tokens
+        json_mode (bool): Ask DeepSeek to return a single valid JSON object
+        
+    Returns:
+        dict: Keyword arguments for chat.completions.create
+    """
+    options = {}
+    if max_tokens:
+        options["max_tokens"] = max_tokens
+    if json_mode:
+        options["response_format"] = {"type": "json_object"}
+    return options
+
+def _create_completion(system_prompt, user_message, temperature, model="deepseek-chat", max_tokens=None, json_mode=False):
+    """
+    Run one chat completion on the shared client, holding one call slot
+    
+    Args:
+        system_prompt (str): Instructions for the AI
+        user_message (str): Current user message
+        temperature (float): Controls randomness in responses
+        model (str): Model to use
+        max_tokens (int, optional): Cap on generated tokens
+        json_mode (bool): Ask DeepSeek to return a single valid JSON object
+        
+    Returns:
+        str: Response text
+    """
+    with llm_call_slots:
+        response = init_openai_client().chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            temperature=temperature,
+            **_completion_options(max_tokens, json_mode)
+        )
+    return response.choices[0].message.content
+
+def _create_completions(requests, model="deepseek-chat", max_tokens=None, json_mode=False):
+    """
+    Run several independent chat completions concurrently
+    
+    The first request runs on the calling thread and the rest on llm_executor,
+    all through the pooled client; each call takes its own slot.
+    
+    Args:
+        requests (list): (system_prompt, user_message, temperature) tuples
+        model (str): Model to use for every request
+        max_tokens (int, optional): Cap on generated tokens for each request
+        json_mode (bool): Ask DeepSeek to return a single valid JSON object
+        
+    Returns:
+        list: Response text for each request, in the same order
+    """
+    futures = [
+        llm_executor.submit(_create_completion, system_prompt, user_message, temperature, model, max_tokens, json_mode)
+        for system_prompt, user_message, temperature in requests[1:]
+    ]
+    system_prompt, user_message, temperature = requests[0]
+    first = _create_completion(system_prompt, user_message, temperature, model, max_tokens, json_mode)
+    return [first] + [future.result() for future in futures]
+
+def generate_response(system_prompt, user_message, conversation_history=None, temperature=0.7, model="deepseek-chat", cache=None,
+                      max_tokens=None, json_mode=False):
     """
     Generate a response using the DeepSeek LLM with LangChain
     
@@ -60,6 +246,10 @@ def generate_response(system_prompt, user_message, conversation_history=None, te
         conversation_history (list): Previous messages in the format 
                                  [{"role": "user/assistant", "content": "message"}]
         temperature (float): Controls randomness in responses
+        cache (bool, optional): Whether to serve and store the response in the cache;
+                                by default only deterministic (temperature 0) requests are cached
+        max_tokens (int, optional): Cap on generated tokens
+        json_mode (bool): Ask DeepSeek to return a single valid JSON object
         
     Returns:
         dict: Response containing text and other attributes
@@ -82,43 +272,51 @@ def generate_response(system_prompt, user_message, conversation_history=None, te
         # Add current user message
         messages.append({"role": "user", "content": user_message})
         
+        # Deterministic requests (or callers opting in) can be served from the cache
+        if cache is None:
+            cache = temperature == 0
+        cache_key = None
+        if cache:
+            cache_key = LLMCache.cache_key(model, messages, temperature, max_tokens, json_mode)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("LLM cache hit")
+                return copy.deepcopy(cached)
+        
         # Generate response using OpenAI API
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature
-        )
+        with llm_call_slots:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                **_completion_options(max_tokens, json_mode)
+            )
         
         response_text = response.choices[0].message.content
         
-        # Try to parse JSON if present
-        try:
-            # Extract JSON if included in response
-            if '{' in response_text and '}' in response_text:
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                json_str = response_text[json_start:json_end]
-                parsed_json = json.loads(json_str)
-                
-                # Return parsed response
-                return {
-                    "text": parsed_json.get("response", response_text),
-                    "intent": parsed_json.get("intent", "general"),
-                    "mock_data": parsed_json.get("mock_data", {}),
-                    "success": True
-                }
-        except json.JSONDecodeError:
-            # If not valid JSON, return as plain text
-            pass
-            
-        # Return plain text response
-        return {
+        # Plain text response unless valid JSON is found below
+        result = {
             "text": response_text,
             "intent": "general",
             "mock_data": {},
             "success": True
         }
         
+        # Use the JSON object if one is included in the response; otherwise keep the plain text
+        parsed_json = extract_json_object(response_text)
+        if parsed_json is not None:
+            result = {
+                "text": parsed_json.get("response", response_text),
+                "intent": parsed_json.get("intent", "general"),
+                "mock_data": parsed_json.get("mock_data", {}),
+                "success": True
+            }
+        
+        if cache_key:
+            response_cache.set(cache_key, copy.deepcopy(result))
+            
+        return result
+        
     except Exception as e:
         logger.error(f"Error generating response: {str(e)}")
         return {
@@ -128,6 +326,19 @@ def generate_response(system_prompt, user_message, conversation_history=None, te
             "success": False
         }
 
+def canonical_city(name):
+    """
+    Normalize a city name or airport code for prompts and cache keys
+    
+    Args:
+        name (str): City name, alternate spelling or IATA code
+        
+    Returns:
+        str: Canonical city name, or the title-cased input if it is not a known alias
+    """
+    name = " ".join(name.split())
+    return CITY_ALIASES.get(name.lower(), name.title())
+
 def generate_flight_options(origin, destination, departure_date, return_date=None, num_options=5):
     """
     Generate mock flight options using DeepSeek
@@ -144,10 +355,16 @@ def generate_flight_options(origin, destination, departure_date, return_date=Non
     """
     try:
         # Set default values for missing parameters
-        origin = origin or "Riyadh"
-        destination = destination or "Jeddah"
+        origin = canonical_city(origin) if origin else "Riyadh"
+        destination = canonical_city(destination) if destination else "Jeddah"
         departure_date = departure_date or "2025-05-01"  # Default to next month
         
+        # Popular routes are served from the cache instead of a new DeepSeek call
+        cache_key = ("flights", origin, destination, departure_date, return_date, num_options)
+        cached = options_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         # Create a system prompt to generate realistic flight data
         system_prompt = f"""You are a flight booking API for Saudi Arabia. Generate {num_options} realistic flight options between {origin} and {destination} for {departure_date}.
         
@@ -166,74 +383,60 @@ def generate_flight_options(origin, destination, departure_date, return_date=Non
         # Generate response from DeepSeek
         user_message = f"Generate flight options from {origin} to {destination} on {departure_date}" + \
                      (f" with return on {return_date}" if return_date else "")
+        requests = [(system_prompt, user_message, 0.5)]
         
-        # Call the DeepSeek API to generate flight data
-        client = init_openai_client()
-        response = client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.5
+        # If it's a round trip, also request return flights
+        if return_date:
+            # Create return flight system prompt
+            return_system_prompt = f"""You are a flight booking API for Saudi Arabia. Generate {num_options} realistic return flight options 
+            from {destination} back to {origin} for {return_date}.
+            
+            Return ONLY a valid JSON object with the following structure:
+            {{"return_flights": [
+                {{"airline": "Saudia", "flight_number": "SV1234", "origin": "{destination}", "destination": "{origin}", 
+                 "departure_date": "{return_date}", "departure_time": "19:30", "arrival_time": "21:15", 
+                 "duration": "1h 45m", "price": 750, "currency": "SAR", "class": "Economy", 
+                 "amenities": ["Wi-Fi", "In-flight entertainment"], "available_seats": 45}}]
+            }}
+            
+            Make sure each flight has a different airline from ["Saudia", "flynas", "flyadeal", "Nesma Airlines", "SaudiGulf Airlines"],
+            realistic flight numbers, departure/arrival times, durations, and prices between 500-2000 SAR.
+            """
+            requests.append((
+                return_system_prompt,
+                f"Generate return flight options from {destination} to {origin} on {return_date}",
+                0.5
+            ))
+        
+        # Call the DeepSeek API for outbound and return flights concurrently
+        response_texts = _create_completions(
+            requests,
+            max_tokens=FLIGHT_OPTION_MAX_TOKENS * num_options,
+            json_mode=True
         )
-        
-        response_text = response.choices[0].message.content
+        response_text = response_texts[0]
         
         # Extract JSON from response
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = response_text[json_start:json_end]
-            flight_data = json.loads(json_str)
-            
+        flight_data = extract_json_object(response_text)
+        if flight_data is not None:
             # Create empty return flights list by default
             return_flights = []
             
-            # If it's a round trip, generate return flights
+            # Extract JSON from return response
             if return_date:
-                # Create return flight system prompt
-                return_system_prompt = f"""You are a flight booking API for Saudi Arabia. Generate {num_options} realistic return flight options 
-                from {destination} back to {origin} for {return_date}.
-                
-                Return ONLY a valid JSON object with the following structure:
-                {{"return_flights": [
-                    {{"airline": "Saudia", "flight_number": "SV1234", "origin": "{destination}", "destination": "{origin}", 
-                     "departure_date": "{return_date}", "departure_time": "19:30", "arrival_time": "21:15", 
-                     "duration": "1h 45m", "price": 750, "currency": "SAR", "class": "Economy", 
-                     "amenities": ["Wi-Fi", "In-flight entertainment"], "available_seats": 45}}]
-                }}
-                
-                Make sure each flight has a different airline from ["Saudia", "flynas", "flyadeal", "Nesma Airlines", "SaudiGulf Airlines"],
-                realistic flight numbers, departure/arrival times, durations, and prices between 500-2000 SAR.
-                """
-                
-                # Generate return flights
-                return_response = client.chat.completions.create(
-                    model="deepseek-chat",
-                    messages=[
-                        {"role": "system", "content": return_system_prompt},
-                        {"role": "user", "content": f"Generate return flight options from {destination} to {origin} on {return_date}"}
-                    ],
-                    temperature=0.5
-                )
-                
-                return_text = return_response.choices[0].message.content
-                
-                # Extract JSON from return response
-                json_start = return_text.find('{')
-                json_end = return_text.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    json_str = return_text[json_start:json_end]
-                    return_data = json.loads(json_str)
+                return_data = extract_json_object(response_texts[1])
+                if return_data is not None:
                     return_flights = return_data.get("return_flights", [])
             
             # Combine and return all flight data
-            return {
+            result = {
                 "flights": flight_data.get("flights", []),
                 "return_flights": return_flights,
                 "is_round_trip": bool(return_date)
             }
+            if result["flights"]:
+                options_cache.set(cache_key, copy.deepcopy(result))
+            return result
         
         # Fallback to empty response if JSON parsing fails
         return {"flights": [], "return_flights": [], "is_round_trip": bool(return_date)}
@@ -257,10 +460,16 @@ def generate_hotel_options(destination, check_in, check_out=None, num_options=5)
     """
     try:
         # Set default values for missing parameters
-        destination = destination or "Riyadh"
+        destination = canonical_city(destination) if destination else "Riyadh"
         check_in = check_in or "2025-05-01"  # Default to next month
         check_out = check_out or "2025-05-05"  # Default to 4-day stay
         
+        # Popular cities and dates are served from the cache instead of a new DeepSeek call
+        cache_key = ("hotels", destination, check_in, check_out, num_options)
+        cached = options_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         # Create a system prompt to generate realistic hotel data
         system_prompt = f"""You are a hotel booking API for Saudi Arabia. Generate {num_options} realistic hotel options in {destination} for a stay from {check_in} to {check_out}.
         
@@ -283,23 +492,24 @@ def generate_hotel_options(destination, check_in, check_out=None, num_options=5)
         
         # Call the DeepSeek API to generate hotel data
         client = init_openai_client()
-        response = client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.5
-        )
+        with llm_call_slots:
+            response = client.chat.completions.create(
+                model="deepseek-chat",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                temperature=0.5,
+                **_completion_options(HOTEL_OPTION_MAX_TOKENS * num_options, json_mode=True)
+            )
         
         response_text = response.choices[0].message.content
         
         # Extract JSON from response
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = response_text[json_start:json_end]
-            hotel_data = json.loads(json_str)
+        hotel_data = extract_json_object(response_text)
+        if hotel_data is not None:
+            if hotel_data.get("hotels"):
+                options_cache.set(cache_key, copy.deepcopy(hotel_data))
             return hotel_data
         
         # Fallback to empty response if JSON parsing fails
@@ -341,6 +551,68 @@ def test_llm_connection():
         logger.error(f"LLM connection test failed: {str(e)}")
         return False
 
+@lru_cache(maxsize=1)
+def _llm_connection_for_bucket(bucket):
+    """Run the connection test once per time bucket"""
+    return test_llm_connection()
+
+def cached_llm_connection(ttl=30):
+    """
+    Test the connection to the DeepSeek LLM, reusing the result for a short window
+    
+    Args:
+        ttl (int): Seconds a connection test result stays valid
+        
+    Returns:
+        bool: True if connection successful, False otherwise
+    """
+    return _llm_connection_for_bucket(int(time.monotonic() // ttl))
+
+def _probe_llm_connection():
+    """Check that DeepSeek answers a cheap models.list() call, without retries"""
+    try:
+        init_openai_client().with_options(timeout=LLM_STATUS_PROBE_TIMEOUT, max_retries=0).models.list()
+        return True
+    except Exception as e:
+        logger.warning(f"LLM status probe failed: {str(e)}")
+        return False
+
+def _refresh_llm_status():
+    """Probe DeepSeek and record the result as the last known status"""
+    global _llm_status, _llm_status_checked_at, _llm_status_refreshing
+    status = False
+    try:
+        status = _probe_llm_connection()
+    finally:
+        with _llm_status_lock:
+            _llm_status = status
+            _llm_status_checked_at = time.monotonic()
+            _llm_status_refreshing = False
+
+def get_llm_status():
+    """
+    Get the last known LLM connection status without blocking
+    
+    When the status is older than LLM_STATUS_TTL, one background thread
+    refreshes it; concurrent callers keep getting the previous value.
+    
+    Returns:
+        bool: True if the last probe succeeded, False if it failed,
+              or None while the first probe is still running
+    """
+    global _llm_status_refreshing
+    with _llm_status_lock:
+        status = _llm_status
+        stale = (_llm_status_checked_at is None
+                 or time.monotonic() - _llm_status_checked_at >= LLM_STATUS_TTL)
+        start_refresh = stale and not _llm_status_refreshing
+        if start_refresh:
+            _llm_status_refreshing = True
+    
+    if start_refresh:
+        threading.Thread(target=_refresh_llm_status, name="llm-status", daemon=True).start()
+    return status
+
 
 def create_agent_node(name: str, process_func: Callable):
     """
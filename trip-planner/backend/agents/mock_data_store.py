@@ -0,0 +1,82 @@
+"""
+Mock Data Store for Trip Planning Assistant
+Keeps the latest mock booking data per session in process; also provides the shared Redis client
+"""
+import os
+import logging
+import threading
+from functools import lru_cache
+from cachetools import TTLCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds a session's mock data is kept
+MOCK_DATA_TTL = 3600
+
+@lru_cache(maxsize=1)
+def get_redis_client():
+    """
+    Get the shared Redis client configured by REDIS_URL
+
+    Returns:
+        redis.Redis: Redis client, or None when REDIS_URL is unset or redis is not installed
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+
+    try:
+        import redis
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is not installed; caching in process")
+        return None
+
+    return redis.Redis.from_url(redis_url)
+
+class MockDataStore:
+    """
+    Session-keyed mock data with expiry
+
+    Kept in a bounded in-process cache; nothing reads a session's data from
+    another worker, so it is not written to Redis. Access is locked because
+    TTLCache is not thread-safe and the app serves requests on threads.
+    """
+
+    def __init__(self, namespace, ttl=MOCK_DATA_TTL, maxsize=10000):
+        """
+        Initialize the store
+
+        Args:
+            namespace (str): Name of the agent the data belongs to, e.g. "flight"
+            ttl (int): Seconds before a session's data expires
+            maxsize (int): Maximum sessions kept
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        """
+        Get the stored mock data for a session
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            dict: Stored mock data, or None if missing or expired
+        """
+        with self._lock:
+            return self._local.get(session_id)
+
+    def set(self, session_id, mock_data):
+        """
+        Store the mock data for a session, replacing any previous value
+
+        Args:
+            session_id (str): Session identifier
+            mock_data (dict): Mock data to store
+        """
+        with self._lock:
+            self._local[session_id] = mock_data
@@ -4,6 +4,7 @@ Generates fictional complete travel packages combining flights and hotels
 """
 import logging
 from .llm_utils import generate_response
+from .history_utils import format_conversation_history
 from .language_utils import detect_language
 
 # Configure logging
@@ -30,9 +31,19 @@ Human: {input}
 AI:
 """
 
-def generate_trip_response(user_message, conversation_history=None, extracted_info=None):
+# Extracted trip fields included in the prompt, in order, with their labels
+_DETAIL_FIELDS = (
+    ("origin", "Origin"),
+    ("destination", "Destination"),
+    ("start_date", "Start date"),
+    ("end_date", "End date"),
+    ("travelers", "Number of travelers"),
+    ("preferences", "Preferences")
+)
+
+def _build_trip_prompt(user_message, conversation_history=None, extracted_info=None):
     """
-    Generate a complete trip planning response
+    Build the trip planning prompt from the message, history and extracted details
     
     Args:
         user_message (str): Current user message
@@ -40,43 +51,44 @@ def generate_trip_response(user_message, conversation_history=None, extracted_in
         extracted_info (dict): Optional extracted information about the trip request
         
     Returns:
-        dict: Response with text and detected language
+        str: Filled prompt
     """
-    # Detect language
-    language = detect_language(user_message)
-    
     # Format conversation history
-    history_text = ""
-    if conversation_history:
-        history_text = "\n".join([
-            f"{'Human' if msg['role'] == 'user' else 'AI'}: {msg['content']}"
-            for msg in conversation_history
-        ])
+    history_text = format_conversation_history(conversation_history) if conversation_history else ""
+    
+    # Fill the placeholders in a single pass
+    prompt = TRIP_AGENT_PROMPT.format(history=history_text, input=user_message)
     
-    # Add extracted information to the prompt if available
-    enhanced_prompt = TRIP_AGENT_PROMPT
+    # Add extracted information to the prompt if available to guide the response
     if extracted_info:
-        # Add details to the prompt to guide the response
-        details = []
-        if 'origin' in extracted_info:
-            details.append(f"Origin: {extracted_info['origin']}")
-        if 'destination' in extracted_info:
-            details.append(f"Destination: {extracted_info['destination']}")
-        if 'start_date' in extracted_info:
-            details.append(f"Start date: {extracted_info['start_date']}")
-        if 'end_date' in extracted_info:
-            details.append(f"End date: {extracted_info['end_date']}")
-        if 'travelers' in extracted_info:
-            details.append(f"Number of travelers: {extracted_info['travelers']}")
-        if 'preferences' in extracted_info:
-            details.append(f"Preferences: {extracted_info['preferences']}")
-            
+        details = "\n".join(
+            f"{label}: {extracted_info[field]}"
+            for field, label in _DETAIL_FIELDS
+            if field in extracted_info
+        )
         if details:
-            enhanced_prompt += "\n\nInclude these details in your response:\n" + "\n".join(details)
+            prompt += "\n\nInclude these details in your response:\n" + details
+    
+    return prompt
+
+def generate_trip_response(user_message, conversation_history=None, extracted_info=None, language=None):
+    """
+    Generate a complete trip planning response
+    
+    Args:
+        user_message (str): Current user message
+        conversation_history (list): Previous messages
+        extracted_info (dict): Optional extracted information about the trip request
+        language (str): Language already detected by the caller; detected from the message if omitted
+        
+    Returns:
+        dict: Response with text and detected language
+    """
+    # Detect language unless the caller already did
+    if language is None:
+        language = detect_language(user_message)
     
-    # Replace placeholders in the prompt
-    prompt = enhanced_prompt.replace("{history}", history_text)
-    prompt = prompt.replace("{input}", user_message)
+    prompt = _build_trip_prompt(user_message, conversation_history, extracted_info)
     
     # Generate response
     response_text = generate_response(
@@ -4,7 +4,6 @@ Combines flight and hotel options into complete trip plans
 """
 import os
 import logging
-import json
 import re
 import random
 from datetime import datetime, timedelta
@@ -3,13 +3,14 @@ Trip Planning Assistant - Flask Backend
 Main application file that sets up routes and handles API requests
 """
 import os
-import uuid
-import json
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, Response, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 import logging
 import sys
+import threading
+from functools import lru_cache
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -34,11 +35,40 @@ CORS(app)  # Enable CORS for all routes
 
 # Import agent system
 from agents.agent_orchestrator import AgentOrchestrator
+from agents.llm_utils import get_llm_status, prewarm_connection
 
 # In-memory session storage for conversation history
 # Format: {session_id: [{"role": "user/assistant", "content": "message"}]}
 sessions = {}
 
+# Static response bodies, serialized once at import time
+_LANGUAGES_BODY = orjson.dumps({
+    "supported_languages": ["en", "ar"],
+    "default_language": "en"
+})
+
+@lru_cache(maxsize=1)
+def get_orchestrator():
+    """Get the shared agent orchestrator, creating it on first use"""
+    return AgentOrchestrator()
+
+def ojsonify(obj, status=200):
+    """
+    Serialize an object to a JSON response using orjson
+    
+    Args:
+        obj (Any): JSON-serializable object
+        status (int): HTTP status code
+        
+    Returns:
+        Response: Flask response
+    """
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+def _new_id():
+    """Generate a random hex identifier for new sessions"""
+    return os.urandom(16).hex()
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """
@@ -60,23 +90,23 @@ def chat():
     }
     """
     try:
-        data = request.json
+        data = orjson.loads(request.get_data())
         message = data.get('message', '')
-        session_id = data.get('session_id', str(uuid.uuid4()))
+        session_id = data.get('session_id') or _new_id()
         
-        # Create new session if it doesn't exist
-        if session_id not in sessions:
-            sessions[session_id] = []
-            logger.info(f"Created new session: {session_id}")
+        # Get or create the session history
+        history = sessions.setdefault(session_id, [])
+        if not history:
+            logger.info("Created new session: %s", session_id)
         
         # Add user message to history
-        sessions[session_id].append({"role": "user", "content": message})
+        history.append({"role": "user", "content": message})
         
         # Process message with agent orchestrator
-        response_data = AgentOrchestrator().process_message(
+        response_data = get_orchestrator().process_message(
             user_message=message,
             session_id=session_id,
-            conversation_history=sessions[session_id]
+            conversation_history=history
         )
         
         # Extract response text and metadata
@@ -85,12 +115,13 @@ def chat():
         intent = response_data["intent"]
         
         # Add assistant response to history
-        sessions[session_id].append({"role": "assistant", "content": response_text})
+        history.append({"role": "assistant", "content": response_text})
         
         # Log the interaction (excluding sensitive data)
-        logger.info(f"Session {session_id}: Processed message with intent {intent}, history length: {len(sessions[session_id])}")
+        logger.info("Session %s: Processed message with intent %s, history length: %d",
+                    session_id, intent, len(history))
         
-        return jsonify({
+        return ojsonify({
             "session_id": session_id,
             "response": response_text,
             "language": language,
@@ -99,64 +130,77 @@ def chat():
         
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}")
-        return jsonify({
+        return ojsonify({
             "error": "An error occurred processing your request",
             "details": str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/reset', methods=['POST'])
 def reset_session():
     """Reset a conversation session"""
     try:
-        data = request.json
+        data = orjson.loads(request.get_data())
         session_id = data.get('session_id', '')
         
         if session_id and session_id in sessions:
             sessions[session_id] = []
-            logger.info(f"Reset session: {session_id}")
-            return jsonify({"status": "success", "message": "Session reset successfully"})
+            logger.info("Reset session: %s", session_id)
+            return ojsonify({"status": "success", "message": "Session reset successfully"})
         else:
-            return jsonify({"status": "error", "message": "Invalid session ID"}), 400
+            return ojsonify({"status": "error", "message": "Invalid session ID"}, 400)
             
     except Exception as e:
         logger.error(f"Error resetting session: {str(e)}")
-        return jsonify({
+        return ojsonify({
             "error": "An error occurred resetting the session",
             "details": str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Simple health check endpoint"""
-    # Test LLM connection
-    try:
-        from agents.llm_utils import test_llm_connection
-        llm_status, message = test_llm_connection()
-        llm_health = "connected" if llm_status else "error"
-    except Exception as e:
+    # Skip the paid LLM connection check under test
+    if app.testing:
+        return ojsonify({
+            "status": "healthy",
+            "version": "1.0.0",
+            "llm_status": "skipped",
+            "llm_message": "LLM connection check skipped in testing mode"
+        })
+    
+    # Last known LLM connection status; a stale one is refreshed in the background
+    llm_status = get_llm_status()
+    if llm_status is None:
+        llm_health = "checking"
+        message = "LLM connection check in progress"
+    elif llm_status:
+        llm_health = "connected"
+        message = "LLM connection successful"
+    else:
         llm_health = "error"
-        message = str(e)
+        message = "LLM connection failed"
     
-    return jsonify({
+    return ojsonify({
         "status": "healthy", 
         "version": "1.0.0",
         "llm_status": llm_health,
-        "llm_message": message if llm_health == "error" else "LLM connection successful"
+        "llm_message": message
     })
 
 @app.route('/api/languages', methods=['GET'])
 def supported_languages():
     """Return supported languages"""
-    return jsonify({
-        "supported_languages": ["en", "ar"],
-        "default_language": "en"
-    })
+    return Response(_LANGUAGES_BODY, mimetype='application/json')
 
 if __name__ == '__main__':
     # Check if DeepSeek API key is set
     if not os.getenv('DEEPSEEK_API_KEY'):
         logger.warning("DEEPSEEK_API_KEY not found in environment variables")
         print("Warning: DEEPSEEK_API_KEY not set in .env file")
+    else:
+        # Pre-warm the DeepSeek connection in the background, off the request path
+        threading.Thread(target=prewarm_connection, daemon=True).start()
     
-    # Run the Flask app
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Run the Flask app (debug mode only when explicitly developing)
+    debug_mode = os.getenv('FLASK_ENV') == 'development'
+    app.run(host='0.0.0.0', port=5000, debug=debug_mode, threaded=True)
@@ -4,10 +4,16 @@ Creates Flask application with proper configuration
 """
 import os
 import logging
+import threading
 from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+def _start_llm_background_tasks():
+    """Import the LLM utilities and open a connection to DeepSeek"""
+    from agents.llm_utils import prewarm_connection
+    prewarm_connection()
+
 def create_app(test_config=None):
     """
     Application factory following Flask best practices
@@ -29,6 +35,8 @@ def create_app(test_config=None):
         SECRET_KEY=os.getenv('SECRET_KEY', 'dev_key_CHANGE_ME_in_production'),
         DEEPSEEK_API_KEY=os.getenv('DEEPSEEK_API_KEY'),
         DEEPSEEK_API_BASE=os.getenv('DEEPSEEK_API_BASE', 'https://api.deepseek.com'),
+        # Reject oversized request bodies before they are read
+        MAX_CONTENT_LENGTH=1024 * 1024,
     )
     
     # Apply test config if provided
@@ -52,4 +60,8 @@ def create_app(test_config=None):
     from routes.api import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # Pre-warm the DeepSeek connection in the background
+    if not app.config.get('TESTING') and app.config.get('DEEPSEEK_API_KEY'):
+        threading.Thread(target=_start_llm_background_tasks, daemon=True).start()
+    
     return app
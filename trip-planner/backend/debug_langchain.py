@@ -4,6 +4,7 @@ Debug script for testing LangChain integration with DeepSeek
 import os
 import json
 from dotenv import load_dotenv
+from http_utils import http_client
 
 # Load environment variables
 load_dotenv()
@@ -28,7 +29,8 @@ try:
         model="deepseek-chat",
         temperature=0.7,
         openai_api_base="https://api.deepseek.com",
-        openai_api_key=DEEPSEEK_API_KEY
+        openai_api_key=DEEPSEEK_API_KEY,
+        http_client=http_client
     )
     print("ChatOpenAI initialized successfully")
     
@@ -5,9 +5,13 @@ Debug script for testing DeepSeek LLM integration with LangChain
 import os
 import sys
 import json
+import asyncio
 import logging
+from functools import lru_cache
+from importlib.metadata import version as package_version, PackageNotFoundError
 from dotenv import load_dotenv
-from openai import OpenAI
+from http_utils import http_client
+from openai import OpenAI, AsyncOpenAI
 from langchain.chat_models import ChatOpenAI
 from langchain.schema.messages import SystemMessage, HumanMessage
 
@@ -27,16 +31,70 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 
-def test_direct_openai():
-    """Test direct OpenAI API integration with DeepSeek"""
+@lru_cache(maxsize=1)
+def _get_llm():
+    """Get the shared LangChain chat model, created on first use"""
+    logger.debug("Initializing LangChain ChatOpenAI with DeepSeek")
+    return ChatOpenAI(
+        model="deepseek-chat",
+        temperature=0.7,
+        openai_api_base="https://api.deepseek.com",
+        openai_api_key=DEEPSEEK_API_KEY,
+        http_client=http_client
+    )
+
+async def _abatch_chat(prompts, system_prompt):
+    """Send all prompts concurrently and collect the replies in order"""
+    async with AsyncOpenAI(api_key=DEEPSEEK_API_KEY, base_url="https://api.deepseek.com") as aclient:
+        responses = await asyncio.gather(*[
+            aclient.chat.completions.create(
+                model="deepseek-chat",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7
+            )
+            for prompt in prompts
+        ])
+    return [response.choices[0].message.content for response in responses]
+
+def batch_chat(prompts, system_prompt="You are a helpful assistant."):
+    """
+    Send several independent prompts to DeepSeek in parallel
+    
+    Args:
+        prompts (list): User prompts to send
+        system_prompt (str): System prompt shared by all requests
+        
+    Returns:
+        list: Response content for each prompt, in the same order
+    """
+    return asyncio.run(_abatch_chat(prompts, system_prompt))
+
+def test_direct_openai(prompts=None):
+    """
+    Test direct OpenAI API integration with DeepSeek
+    
+    Args:
+        prompts (list, optional): Prompts to send concurrently instead of the default greeting
+    """
     logger.info("Testing direct OpenAI integration with DeepSeek")
     
     try:
+        if prompts:
+            logger.debug("Sending %s prompts to DeepSeek concurrently", len(prompts))
+            contents = batch_chat(prompts)
+            for content in contents:
+                logger.info("Content: %s", content)
+            return True, contents
+        
         # Initialize client
-        logger.debug(f"Initializing OpenAI client with base URL: https://api.deepseek.com")
+        logger.debug("Initializing OpenAI client with base URL: https://api.deepseek.com")
         client = OpenAI(
             api_key=DEEPSEEK_API_KEY,
-            base_url="https://api.deepseek.com"
+            base_url="https://api.deepseek.com",
+            http_client=http_client
         )
         
         # Create messages
@@ -45,7 +103,7 @@ def test_direct_openai():
             {"role": "user", "content": "Say hello in Arabic."}
         ]
         
-        logger.debug(f"Sending request to DeepSeek with messages: {messages}")
+        logger.debug("Sending request to DeepSeek with messages: %s", messages)
         
         # Generate response
         response = client.chat.completions.create(
@@ -54,13 +112,13 @@ def test_direct_openai():
             temperature=0.7
         )
         
-        logger.info(f"Received response from DeepSeek: {response}")
-        logger.info(f"Content: {response.choices[0].message.content}")
+        logger.info("Received response from DeepSeek: %s", response)
+        logger.info("Content: %s", response.choices[0].message.content)
         
         return True, response.choices[0].message.content
     
     except Exception as e:
-        logger.error(f"Error in direct OpenAI test: {str(e)}", exc_info=True)
+        logger.error("Error in direct OpenAI test: %s", e, exc_info=True)
         return False, str(e)
 
 def test_langchain_integration():
@@ -68,33 +126,24 @@ def test_langchain_integration():
     logger.info("Testing LangChain integration with DeepSeek")
     
     try:
-        # Initialize LangChain chat model
-        logger.debug(f"Initializing LangChain ChatOpenAI with DeepSeek")
-        llm = ChatOpenAI(
-            model="deepseek-chat",
-            temperature=0.7,
-            openai_api_base="https://api.deepseek.com",
-            openai_api_key=DEEPSEEK_API_KEY
-        )
-        
         # Create messages
         messages = [
             SystemMessage(content="You are a helpful assistant."),
             HumanMessage(content="What's the capital of Saudi Arabia?")
         ]
         
-        logger.debug(f"Sending request to DeepSeek using LangChain with messages: {messages}")
+        logger.debug("Sending request to DeepSeek using LangChain with messages: %s", messages)
         
         # Generate response
-        response = llm.invoke(messages)
+        response = _get_llm().invoke(messages)
         
-        logger.info(f"Received response from LangChain: {response}")
-        logger.info(f"Content: {response.content}")
+        logger.info("Received response from LangChain: %s", response)
+        logger.info("Content: %s", response.content)
         
         return True, response.content
     
     except Exception as e:
-        logger.error(f"Error in LangChain test: {str(e)}", exc_info=True)
+        logger.error("Error in LangChain test: %s", e, exc_info=True)
         return False, str(e)
 
 def check_environment():
@@ -107,11 +156,9 @@ def check_environment():
             logger.error("DEEPSEEK_API_KEY not found in environment variables")
             return False, "API key not found"
         
-        logger.debug(f"API key found: {DEEPSEEK_API_KEY[:5]}...")
+        logger.debug("API key found: %s...", DEEPSEEK_API_KEY[:5])
         
         # Check package versions
-        import pkg_resources
-        
         packages = [
             "openai",
             "langchain",
@@ -122,17 +169,17 @@ def check_environment():
         version_info = {}
         for package in packages:
             try:
-                version = pkg_resources.get_distribution(package).version
+                version = package_version(package)
                 version_info[package] = version
-                logger.debug(f"{package}: {version}")
-            except pkg_resources.DistributionNotFound:
-                logger.error(f"{package} not installed")
+                logger.debug("%s: %s", package, version)
+            except PackageNotFoundError:
+                logger.error("%s not installed", package)
                 version_info[package] = "Not installed"
         
         return True, version_info
     
     except Exception as e:
-        logger.error(f"Error checking environment: {str(e)}", exc_info=True)
+        logger.error("Error checking environment: %s", e, exc_info=True)
         return False, str(e)
 
 if __name__ == "__main__":
@@ -142,25 +189,25 @@ if __name__ == "__main__":
     logger.info("=" * 50)
     env_status, env_info = check_environment()
     if env_status:
-        logger.info(f"Environment check successful: {json.dumps(env_info, indent=2)}")
+        logger.info("Environment check successful: %s", json.dumps(env_info, indent=2))
     else:
-        logger.error(f"Environment check failed: {env_info}")
+        logger.error("Environment check failed: %s", env_info)
     
     # Test direct OpenAI integration
     logger.info("=" * 50)
     openai_status, openai_response = test_direct_openai()
     if openai_status:
-        logger.info(f"Direct OpenAI test successful: {openai_response}")
+        logger.info("Direct OpenAI test successful: %s", openai_response)
     else:
-        logger.error(f"Direct OpenAI test failed: {openai_response}")
+        logger.error("Direct OpenAI test failed: %s", openai_response)
     
     # Test LangChain integration
     logger.info("=" * 50)
     langchain_status, langchain_response = test_langchain_integration()
     if langchain_status:
-        logger.info(f"LangChain test successful: {langchain_response}")
+        logger.info("LangChain test successful: %s", langchain_response)
     else:
-        logger.error(f"LangChain test failed: {langchain_response}")
+        logger.error("LangChain test failed: %s", langchain_response)
     
     logger.info("=" * 50)
     logger.info("Debug script completed")
@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for the Trip Planning Assistant backend
+Usage: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import os
+
+# Bind to the same port the frontend expects unless overridden
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# gevent workers multiplex many in-flight requests while they wait on DeepSeek
+worker_class = "gevent"
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_connections = 1000
+
+# LLM round-trips can be slow; leave headroom before a worker is recycled
+timeout = 120
+keepalive = 5
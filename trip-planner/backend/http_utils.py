@@ -0,0 +1,13 @@
+"""
+HTTP Utilities for Trip Planning Assistant scripts
+Provides one pooled HTTP client shared by the debug and test scripts
+"""
+import atexit
+import httpx
+
+# Shared HTTP client so repeated DeepSeek calls reuse pooled keep-alive connections
+http_client = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+    timeout=60
+)
+atexit.register(http_client.close)
@@ -3,9 +3,9 @@ API Routes for Trip Planning Assistant
 Defines all REST endpoints for the application
 """
 import logging
-import json
-from flask import Blueprint, request, jsonify
-from agents.agent_system import AgentSystem
+from functools import lru_cache
+import orjson
+from flask import Blueprint, Response, current_app, request
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -13,19 +13,114 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 api_bp = Blueprint('api', __name__)
 
-# Initialize Agent System
-agent_system = AgentSystem()
+# Static response bodies, serialized once at import time
+_LANGUAGES_BODY = orjson.dumps({
+    "success": True,
+    "error": None,
+    "data": {
+        "supported_languages": ["english", "arabic"],
+        "default_language": "english"
+    }
+})
+_HEALTH_ERROR_BODY = orjson.dumps({
+    "success": False,
+    "error": "Internal server error",
+    "data": {
+        "status": "unhealthy",
+        "version": "1.0.4",
+        "llm_status": False
+    }
+})
+
+@lru_cache(maxsize=None)
+def _error_body(message):
+    """
+    Get the serialized error envelope for a fixed error message
+    
+    Args:
+        message (str): Error message
+        
+    Returns:
+        bytes: JSON response body
+    """
+    return orjson.dumps({"success": False, "error": message, "data": None})
+
+def _json_response(body, status=200):
+    """
+    Wrap a pre-serialized JSON body in a response
+    
+    Args:
+        body (bytes): JSON response body
+        status (int): HTTP status code
+        
+    Returns:
+        Response: Flask response
+    """
+    return Response(body, status=status, mimetype='application/json')
+
+def _get_json_body():
+    """
+    Parse the request body as JSON using orjson
+    
+    Returns:
+        Any: Parsed body, or None if the request is not valid JSON
+    """
+    if not request.is_json:
+        return None
+    
+    try:
+        return orjson.loads(request.get_data(cache=True))
+    except orjson.JSONDecodeError:
+        return None
+
+def ojsonify(obj, status=200):
+    """
+    Serialize an object to a JSON response using orjson
+    
+    Args:
+        obj (Any): JSON-serializable object
+        status (int): HTTP status code
+        
+    Returns:
+        Response: Flask response
+    """
+    return _json_response(orjson.dumps(obj), status)
+
+# Template for a fresh session; containers are recreated per session
+_EMPTY_SESSION = {
+    "conversation_history": [],
+    "flight_options": [],
+    "hotel_options": [],
+    "language": "english",
+    "mock_data": {},
+    "user_preferences": {}
+}
+
+@lru_cache(maxsize=1)
+def get_agent_system():
+    """
+    Get the shared Agent System instance, creating it on first use
+    
+    The agents (and with them openai/langchain) are imported here rather than
+    at module load so workers start without paying for them until needed.
+    
+    Returns:
+        AgentSystem: The process-wide agent system
+    """
+    from agents.agent_system import AgentSystem
+    
+    return AgentSystem()
 
 @api_bp.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     try:
-        from agents.llm_utils import test_llm_connection
+        from agents.llm_utils import get_llm_status
         
-        # Test LLM connection
-        llm_status = test_llm_connection()
+        # Last known LLM status (None until the first probe finishes); skip it under test
+        llm_status = None if current_app.testing else get_llm_status()
         
-        return jsonify({
+        return ojsonify({
             "success": True,
             "error": None,
             "data": {
@@ -33,40 +128,16 @@ def health():
                 "version": "1.0.4",
                 "llm_status": llm_status
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error in health endpoint: {str(e)}", exc_info=True)
-        return jsonify({
-            "success": False,
-            "error": "Internal server error",
-            "data": {
-                "status": "unhealthy",
-                "version": "1.0.4",
-                "llm_status": False
-            }
-        }), 500
+        return _json_response(_HEALTH_ERROR_BODY, 500)
 
 @api_bp.route('/languages', methods=['GET'])
 def languages():
     """Get supported languages"""
-    try:
-        return jsonify({
-            "success": True,
-            "error": None,
-            "data": {
-                "supported_languages": ["english", "arabic"],
-                "default_language": "english"
-            }
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error in languages endpoint: {str(e)}", exc_info=True)
-        return jsonify({
-            "success": False,
-            "error": "Internal server error",
-            "data": None
-        }), 500
+    return _json_response(_LANGUAGES_BODY)
 
 @api_bp.route('/chat', methods=['POST'])
 def chat():
@@ -85,14 +156,10 @@ def chat():
     """
     try:
         # Parse request data
-        data = request.get_json()
+        data = _get_json_body()
         
         if not data:
-            return jsonify({
-                "success": False,
-                "error": "Missing request body",
-                "data": None
-            }), 400
+            return _json_response(_error_body("Missing request body"), 400)
         
         # Extract required fields
         message = data.get('message')
@@ -101,48 +168,36 @@ def chat():
         
         # Validate required fields
         if not message:
-            return jsonify({
-                "success": False,
-                "error": "Missing 'message' field",
-                "data": None
-            }), 400
+            return _json_response(_error_body("Missing 'message' field"), 400)
             
         if not session_id:
-            return jsonify({
-                "success": False,
-                "error": "Missing 'session_id' field",
-                "data": None
-            }), 400
+            return _json_response(_error_body("Missing 'session_id' field"), 400)
         
         # Process message using Agent System
-        response = agent_system.process_message(
+        response = get_agent_system().process_message(
             session_id=session_id,
             message=message,
             language=language
         )
         
         # Format response
-        return jsonify({
+        text = response.get("text", "")
+        return ojsonify({
             "success": True,
             "error": None,
             "data": {
-                "text": response.get("text", ""),
+                "text": text,
                 "intent": response.get("intent", "unknown"),
                 "mock_data": response.get("mock_data", {}),
                 "session_id": session_id,
-                "intent": response.get("intent", "unknown"),
                 "language": language,
-                "response": response.get("text", "")
+                "response": text
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error in /chat endpoint: {str(e)}", exc_info=True)
-        return jsonify({
-            "success": False,
-            "error": "Internal server error",
-            "data": None
-        }), 500
+        return _json_response(_error_body("Internal server error"), 500)
 
 @api_bp.route('/test-connection', methods=['GET'])
 def test_connection():
@@ -153,96 +208,64 @@ def test_connection():
         JSON response with connection status
     """
     try:
-        from agents.llm_utils import test_llm_connection
+        from agents.llm_utils import cached_llm_connection
         
-        # Test connection
-        result = test_llm_connection()
+        # Test connection (result reused for 30 seconds)
+        result = cached_llm_connection()
         
-        return jsonify({
+        return ojsonify({
             "success": result,
             "error": None if result else "Failed to connect to DeepSeek API",
             "data": {
                 "connected": result
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error in /test-connection endpoint: {str(e)}", exc_info=True)
-        return jsonify({
-            "success": False,
-            "error": "Internal server error",
-            "data": None
-        }), 500
+        return _json_response(_error_body("Internal server error"), 500)
 
 @api_bp.route('/reset', methods=['POST'])
 def reset_session():
     """Reset a session"""
     try:
         # Parse request data
-        data = request.get_json()
+        data = _get_json_body()
         
         if not data:
-            return jsonify({
-                "success": False,
-                "error": "Missing request body",
-                "data": None
-            }), 400
+            return _json_response(_error_body("Missing request body"), 400)
         
         # Extract required fields
         session_id = data.get('session_id')
         
         # Validate required fields
         if not session_id:
-            return jsonify({
-                "success": False,
-                "error": "Missing 'session_id' field",
-                "data": None
-            }), 400
-        
-        # Check if session exists
-        if session_id in agent_system.sessions:
-            # Reset the session
+            return _json_response(_error_body("Missing 'session_id' field"), 400)
+        
+        agent_system = get_agent_system()
+        
+        # Reset the session, creating it if it doesn't exist
+        with agent_system.sessions_lock:
+            existed = session_id in agent_system.sessions
             agent_system.sessions[session_id] = {
-                "conversation_history": [],
-                "flight_options": [],
-                "hotel_options": [],
-                "language": "english",
-                "mock_data": {},
-                "user_preferences": {}
+                key: type(value)() if isinstance(value, (list, dict)) else value
+                for key, value in _EMPTY_SESSION.items()
             }
-            
-            return jsonify({
-                "success": True,
-                "error": None,
-                "data": {
-                    "status": "success",
-                    "message": f"Session {session_id} has been reset"
-                }
-            }), 200
+        
+        if existed:
+            message = f"Session {session_id} has been reset"
         else:
-            # Session doesn't exist, create it
-            agent_system.sessions[session_id] = {
-                "conversation_history": [],
-                "flight_options": [],
-                "hotel_options": [],
-                "language": "english",
-                "mock_data": {},
-                "user_preferences": {}
+            message = f"New session {session_id} has been created"
+        
+        return ojsonify({
+            "success": True,
+            "error": None,
+            "data": {
+                "status": "success",
+                "message": message
             }
-            
-            return jsonify({
-                "success": True,
-                "error": None,
-                "data": {
-                    "status": "success",
-                    "message": f"New session {session_id} has been created"
-                }
-            }), 200
+        }, 200)
             
     except Exception as e:
         logger.error(f"Error in reset endpoint: {str(e)}", exc_info=True)
-        return jsonify({
-            "success": False,
-            "error": "Internal server error",
-            "data": None
-        }), 500
+        return _json_response(_error_body("Internal server error"), 500)
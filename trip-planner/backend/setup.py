@@ -4,11 +4,18 @@ setup(
     name="trip-planner",
     version="1.0.6",
     packages=find_packages(),
+    package_data={
+        'src.agents': ['templates/*.j2']
+    },
     install_requires=[
         'flask==2.0.1',
         'flask-cors==3.0.10',
+        'Jinja2>=3.0',
         'python-dotenv==0.19.0',
+        'orjson>=3.8.0',
+        'cachetools>=5.3.0',
         'openai>=1.12.0',
+        'httpx[http2]>=0.25.0',
         'langchain>=0.1.0',
         'langchain-openai>=0.0.2',
         'langgraph>=0.0.20'
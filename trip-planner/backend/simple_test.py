@@ -6,6 +6,7 @@ import os
 import json
 import unittest
 from dotenv import load_dotenv
+from http_utils import http_client
 from openai import OpenAI
 
 # Load environment variables
@@ -15,18 +16,20 @@ DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 class SimpleTest(unittest.TestCase):
     """Basic test class for Trip Planning Assistant"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.client = OpenAI(
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once for all tests"""
+        cls.client = OpenAI(
             api_key=DEEPSEEK_API_KEY,
-            base_url="https://api.deepseek.com"
+            base_url="https://api.deepseek.com",
+            http_client=http_client
         )
 
         # Test system
         print("\nTesting system...")
 
         try:
-            response = self.client.chat.completions.create(
+            response = cls.client.chat.completions.create(
                 model="deepseek-chat",
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant."},
@@ -36,7 +39,7 @@ class SimpleTest(unittest.TestCase):
             )
             print(f"API Response: {response.choices[0].message.content[:100]}...")
         except Exception as e:
-            self.fail(f"API connection test failed: {str(e)}")
+            raise AssertionError(f"API connection test failed: {str(e)}")
     
     def test_api_connection(self):
         """Test connection to DeepSeek API"""
@@ -10,6 +10,23 @@ from .language_utils import detect_language, format_response_for_language
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Saudi cities to look for in user messages
+SAUDI_CITIES = (
+    "Riyadh", "Jeddah", "Dammam", "Medina", "Mecca", "Al Khobar",
+    "Tabuk", "Abha", "Taif", "Yanbu", "Jubail", "Dhahran"
+)
+_CITY_NAMES = {city.lower(): city for city in SAUDI_CITIES}
+# First words of multi-word city names such as "Al Khobar"
+_CITY_PREFIXES = frozenset(name.split()[0] for name in _CITY_NAMES if " " in name)
+_WORD_RE = re.compile(r'\w+')
+
+# Flight class keywords in priority order, mapped to the stored preference
+FLIGHT_CLASS_KEYWORDS = (
+    ("business class", "business"),
+    ("first class", "first"),
+    ("economy", "economy")
+)
+
 class AgentOrchestrator:
     """
     Orchestrates the conversation flow between different specialized agents
@@ -39,10 +56,10 @@ class AgentOrchestrator:
                 
             # Detect language
             language = detect_language(user_message)
-            logger.info(f"Processing message in {language} for session {session_id}")
+            logger.info("Processing message in %s for session %s", language, session_id)
             
             # Update user preferences based on conversation
-            self._update_preferences(user_message, conversation_history)
+            self._update_preferences(user_message, conversation_history, language)
             
             # Process message with agent system
             response = self.agent_system.process_message(
@@ -62,11 +79,11 @@ class AgentOrchestrator:
             response["session_id"] = session_id
             response["text"] = response_text
             
-            logger.info(f"Generated response for session {session_id} with intent {response['intent']}")
+            logger.info("Generated response for session %s with intent %s", session_id, response['intent'])
             return response
             
         except Exception as e:
-            logger.error(f"Error in Agent Orchestrator: {str(e)}")
+            logger.error("Error in Agent Orchestrator: %s", e)
             return {
                 "text": "I'm sorry, I encountered an error processing your request. Please try again.",
                 "language": language if 'language' in locals() else "english",
@@ -74,35 +91,32 @@ class AgentOrchestrator:
                 "session_id": session_id
             }
     
-    def _update_preferences(self, user_message, conversation_history):
+    def _update_preferences(self, user_message, conversation_history, language):
         """
         Update user preferences based on conversation
         
         Args:
             user_message (str): Current user message
             conversation_history (list): Previous messages
+            language (str): Language already detected for the message
         """
-        try:
-            # Track language preference
-            language = detect_language(user_message)
-            self.user_preferences["language"] = language
-            
-            # Simple keyword-based preference tracking
-            if "business class" in user_message.lower():
-                self.user_preferences["flight_class"] = "business"
-            elif "economy" in user_message.lower():
-                self.user_preferences["flight_class"] = "economy"
-            
-            # Extract destination preferences
-            destinations = self._extract_destinations(user_message)
-            if destinations:
-                self.user_preferences["destinations"] = destinations
-                
-            # Log updated preferences
-            logger.info(f"Updated user preferences: {self.user_preferences}")
+        # Track language preference
+        self.user_preferences["language"] = language
+        
+        # Simple keyword-based preference tracking
+        msg_lower = user_message.lower()
+        for keyword, flight_class in FLIGHT_CLASS_KEYWORDS:
+            if keyword in msg_lower:
+                self.user_preferences["flight_class"] = flight_class
+                break
+        
+        # Extract destination preferences
+        destinations = self._extract_destinations(user_message)
+        if destinations:
+            self.user_preferences["destinations"] = destinations
             
-        except Exception as e:
-            logger.error(f"Error updating preferences: {str(e)}")
+        # Log updated preferences
+        logger.info("Updated user preferences: %s", self.user_preferences)
     
     def _extract_destinations(self, message):
         """
@@ -114,15 +128,15 @@ class AgentOrchestrator:
         Returns:
             list: Extracted destinations
         """
-        # List of Saudi cities to look for
-        saudi_cities = [
-            "Riyadh", "Jeddah", "Dammam", "Medina", "Mecca", "Al Khobar", 
-            "Tabuk", "Abha", "Taif", "Yanbu", "Jubail", "Dhahran"
-        ]
+        # Tokenize once and look words up in the city table; keep first-mention order
+        words = _WORD_RE.findall(message.lower())
+        found_destinations = {}
         
-        found_destinations = []
-        for city in saudi_cities:
-            if re.search(r'\b' + city + r'\b', message, re.IGNORECASE):
-                found_destinations.append(city)
-                
-        return found_destinations
+        for i, word in enumerate(words):
+            if word in _CITY_PREFIXES and i + 1 < len(words):
+                word = f"{word} {words[i + 1]}"
+            city = _CITY_NAMES.get(word)
+            if city:
+                found_destinations.setdefault(city)
+        
+        return list(found_destinations)
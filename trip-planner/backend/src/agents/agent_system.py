@@ -2,30 +2,90 @@
 Agent System for Trip Planning Assistant
 Orchestrates the different agents and manages the conversation flow
 """
+import asyncio
 import logging
 import re
+import threading
+from functools import cached_property
+from collections import OrderedDict, deque
 from .conversation_lead_agent import ConversationLeadAgent
 from .flight_booking_agent import FlightBookingAgent
 from .hotel_booking_agent import HotelBookingAgent
 from .trip_planning_agent import TripPlanningAgent
+from . import llm_utils
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Session store limits
+MAX_SESSIONS = 10000
+MAX_HISTORY_MESSAGES = 20
+# Sessions are split across independently locked shards; must be a power of two
+SESSION_SHARDS = 16
+
+# Conversation history is stored as parallel role and content arrays
+ROLE_USER = 0
+ROLE_ASSISTANT = 1
+_ROLE_NAMES = ("user", "assistant")
+
+# Date formats accepted in messages: 2025-05-01, 1/5/2025, 1 May 2025
+_DATE_PATTERN = r'(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})'
+
+# Flight parameters in one pattern; each alternative names the parameter it captures.
+# Terminators are lookaheads so "from X to Y" yields both origin and destination.
+_FLIGHT_RE = re.compile(
+    r'from\s+(?P<origin>[A-Za-z\s]+?)(?=\s+to|\s+on|\s+for|\s+in|\s+with|\s+\d|\s*$)'
+    r'|to\s+(?P<destination>[A-Za-z\s]+?)(?=\s+from|\s+on|\s+for|\s+in|\s+with|\s+\d|\s*$)'
+    r'|(?:on|for)\s+(?P<date>' + _DATE_PATTERN + r')'
+    r'|(?P<passengers>\d+)\s+(?:passenger|passengers|people|person|adult|adults)',
+    re.IGNORECASE
+)
+
+# Hotel parameter patterns
+_CITY_RE = re.compile(r'(?:in|at|to)\s+([A-Za-z\s]+?)(?:\s+from|\s+on|\s+for|\s+with|\s+\d|\s*$)', re.IGNORECASE)
+_CHECK_IN_RE = re.compile(r'(?:from|check[\s-]in)\s+' + _DATE_PATTERN, re.IGNORECASE)
+_CHECK_OUT_RE = re.compile(r'(?:to|until|check[\s-]out)\s+' + _DATE_PATTERN, re.IGNORECASE)
+_GUESTS_RE = re.compile(r'(\d+)\s+(?:guest|guests|people|person|adult|adults)', re.IGNORECASE)
+_ROOMS_RE = re.compile(r'(\d+)\s+(?:room|rooms)', re.IGNORECASE)
+
+# Trip parameter patterns
+_DURATION_RE = re.compile(r'(\d+)\s+(?:day|days|night|nights)', re.IGNORECASE)
+INTEREST_KEYWORDS = (
+    "history", "culture", "museum", "art", "architecture", "food", "cuisine",
+    "shopping", "beach", "nature", "hiking", "adventure", "family", "luxury",
+    "budget", "religious", "sightseeing", "relaxation", "sports"
+)
+_INTEREST_SET = frozenset(INTEREST_KEYWORDS)
+_WORD_RE = re.compile(r'\w+')
+
 class AgentSystem:
     """Agent System class for orchestrating the different agents"""
     
     def __init__(self):
         """Initialize the Agent System with all the specialized agents"""
+        # Every message goes through the lead agent; specialists are built on first use
         self.conversation_lead = ConversationLeadAgent()
-        self.flight_booking = FlightBookingAgent()
-        self.hotel_booking = HotelBookingAgent()
-        self.trip_planning = TripPlanningAgent()
         
-        # Session state
-        self.sessions = {}
+        # Session state, least recently used first within each shard
+        self._shards = [OrderedDict() for _ in range(SESSION_SHARDS)]
+        self._shard_locks = [threading.Lock() for _ in range(SESSION_SHARDS)]
         
-        logger.info("Agent System initialized with all specialized agents")
+        logger.info("Agent System initialized")
+    
+    @cached_property
+    def flight_booking(self):
+        """Flight booking agent, created the first time a flight request arrives"""
+        return FlightBookingAgent()
+    
+    @cached_property
+    def hotel_booking(self):
+        """Hotel booking agent, created the first time a hotel request arrives"""
+        return HotelBookingAgent()
+    
+    @cached_property
+    def trip_planning(self):
+        """Trip planning agent, created the first time a trip request arrives"""
+        return TripPlanningAgent()
     
     def process_message(self, session_id, message, language="english"):
         """
@@ -40,38 +100,15 @@ class AgentSystem:
             dict: Response with text and metadata
         """
         try:
-            # Initialize session if it doesn't exist
-            if session_id not in self.sessions:
-                self.sessions[session_id] = {
-                    "conversation_history": [],
-                    "flight_options": [],
-                    "hotel_options": [],
-                    "language": language
-                }
-            
-            # Update session language if provided
-            if language:
-                self.sessions[session_id]["language"] = language
-            else:
-                language = self.sessions[session_id]["language"]
-            
-            # Add user message to conversation history
-            self.sessions[session_id]["conversation_history"].append({
-                "role": "user",
-                "content": message
-            })
-            
-            # Process message with Conversation Lead Agent to determine intent
-            lead_response = self.conversation_lead.process_message(message, language)
-            intent = lead_response["intent"]
+            session, language, extracted, intent, lead_response = self._begin_turn(session_id, message, language)
             
             # Process based on intent
             if intent == "flight_booking":
-                response = self._handle_flight_booking(session_id, message, language)
+                response = self._handle_flight_booking(session_id, message, language, extracted)
             elif intent == "hotel_booking":
-                response = self._handle_hotel_booking(session_id, message, language)
+                response = self._handle_hotel_booking(session_id, message, language, extracted)
             elif intent == "trip_planning":
-                response = self._handle_trip_planning(session_id, message, language)
+                response = self._handle_trip_planning(session_id, message, language, extracted)
             else:
                 # General conversation
                 response = {
@@ -79,13 +116,7 @@ class AgentSystem:
                     "intent": "general"
                 }
             
-            # Add assistant response to conversation history
-            self.sessions[session_id]["conversation_history"].append({
-                "role": "assistant",
-                "content": response["text"]
-            })
-            
-            return response
+            return self._finish_turn(session, response)
         except Exception as e:
             logger.error(f"Error in Agent System: {str(e)}")
             return {
@@ -93,192 +124,372 @@ class AgentSystem:
                 "intent": "error"
             }
     
-    def _handle_flight_booking(self, session_id, message, language):
+    async def aprocess_message(self, session_id, message, language="english"):
         """
-        Handle flight booking intent
+        Async variant of process_message for callers running an event loop
+        
+        Flight and hotel requests await the booking agents' DeepSeek calls;
+        trip planning runs its blocking calls in a worker thread.
         
         Args:
             session_id (str): Session identifier
             message (str): User message
-            language (str): Language of the conversation
+            language (str): Language of the conversation (english or arabic)
             
         Returns:
-            dict: Response with flight options
+            dict: Response with text and metadata
         """
         try:
-            # Extract flight parameters from the message
-            params = self._extract_flight_params(message)
+            session, language, extracted, intent, lead_response = self._begin_turn(session_id, message, language)
             
-            if params["origin"] and params["destination"] and params["date"]:
-                # Generate flight options
-                flight_response = self.flight_booking.generate_flight_options(
-                    origin=params["origin"],
-                    destination=params["destination"],
-                    date=params["date"],
-                    passengers=params["passengers"],
-                    class_type=params["class_type"],
-                    language=language
+            # Process based on intent
+            if intent == "flight_booking":
+                response = await self._ahandle_flight_booking(session_id, message, language, extracted)
+            elif intent == "hotel_booking":
+                response = await self._ahandle_hotel_booking(session_id, message, language, extracted)
+            elif intent == "trip_planning":
+                response = await asyncio.to_thread(
+                    self._handle_trip_planning, session_id, message, language, extracted
                 )
-                
-                # Store flight options in session
-                self.sessions[session_id]["flight_options"] = flight_response["flight_options"]
-                
-                return {
-                    "text": flight_response["text"],
-                    "intent": "flight_booking",
-                    "flight_options": flight_response["flight_options"]
-                }
             else:
-                # Not enough information, use conversation lead response
-                lead_response = self.conversation_lead.process_message(
-                    f"I need more information to book a flight. Please tell me your origin, destination, and travel date. {message}",
-                    language
-                )
-                
-                return {
+                # General conversation
+                response = {
                     "text": lead_response["text"],
-                    "intent": "flight_booking_info_needed"
+                    "intent": "general"
                 }
+            
+            return self._finish_turn(session, response)
         except Exception as e:
-            logger.error(f"Error handling flight booking: {str(e)}")
+            logger.error(f"Error in Agent System: {str(e)}")
             return {
-                "text": "I'm sorry, I encountered an error processing your flight booking request.",
+                "text": "I'm sorry, I encountered an error processing your request. Please try again.",
                 "intent": "error"
             }
     
-    def _handle_hotel_booking(self, session_id, message, language):
+    def _begin_turn(self, session_id, message, language):
         """
-        Handle hotel booking intent
+        Record the user message and determine the intent of a turn
         
         Args:
             session_id (str): Session identifier
             message (str): User message
-            language (str): Language of the conversation
+            language (str): Language of the conversation (english or arabic)
             
         Returns:
-            dict: Response with hotel options
+            tuple: (session, language, extracted parameters, intent, lead agent response or None)
         """
-        try:
-            # Extract hotel parameters from the message
-            params = self._extract_hotel_params(message)
+        session = self._get_session(session_id, language)
+        
+        # Update session language if provided
+        if language:
+            session["language"] = language
+        else:
+            language = session["language"]
+        
+        # Add user message to conversation history
+        session["roles"].append(ROLE_USER)
+        session["contents"].append(message)
+        
+        # Extract parameters once; the handlers reuse them
+        extracted = {
+            "flight": self._extract_flight_params(message),
+            "hotel": self._extract_hotel_params(message),
+            "trip": self._extract_trip_params(message)
+        }
+        flight_params = extracted["flight"]
+        hotel_params = extracted["hotel"]
+        
+        # Complete booking details identify the intent without a lead agent LLM call
+        lead_response = None
+        if flight_params["origin"] and flight_params["destination"] and flight_params["date"]:
+            intent = "flight_booking"
+        elif hotel_params["city"] and hotel_params["check_in"] and hotel_params["check_out"]:
+            intent = "hotel_booking"
+        else:
+            # Process message with Conversation Lead Agent to determine intent
+            lead_response = self.conversation_lead.process_message(message, language)
+            intent = lead_response["intent"]
+        
+        return session, language, extracted, intent, lead_response
+    
+    def _finish_turn(self, session, response):
+        """Add the assistant response to the conversation history and return it"""
+        session["roles"].append(ROLE_ASSISTANT)
+        session["contents"].append(response["text"])
+        return response
+    
+    def _get_session(self, session_id, language):
+        """
+        Get a session, creating it if needed and evicting the least recently used one when full
+        
+        Args:
+            session_id (str): Session identifier
+            language (str): Language for a newly created session
             
-            if params["city"] and params["check_in"] and params["check_out"]:
-                # Generate hotel options
-                hotel_response = self.hotel_booking.generate_hotel_options(
-                    city=params["city"],
-                    check_in=params["check_in"],
-                    check_out=params["check_out"],
-                    guests=params["guests"],
-                    rooms=params["rooms"],
-                    language=language
-                )
-                
-                # Store hotel options in session
-                self.sessions[session_id]["hotel_options"] = hotel_response["hotel_options"]
-                
-                return {
-                    "text": hotel_response["text"],
-                    "intent": "hotel_booking",
-                    "hotel_options": hotel_response["hotel_options"]
-                }
-            else:
-                # Not enough information, use conversation lead response
-                lead_response = self.conversation_lead.process_message(
-                    f"I need more information to book a hotel. Please tell me the city, check-in date, and check-out date. {message}",
-                    language
-                )
-                
-                return {
-                    "text": lead_response["text"],
-                    "intent": "hotel_booking_info_needed"
-                }
-        except Exception as e:
-            logger.error(f"Error handling hotel booking: {str(e)}")
-            return {
-                "text": "I'm sorry, I encountered an error processing your hotel booking request.",
-                "intent": "error"
+        Returns:
+            dict: Session state
+        """
+        index = hash(session_id) & (SESSION_SHARDS - 1)
+        shard = self._shards[index]
+        
+        with self._shard_locks[index]:
+            session = shard.get(session_id)
+            if session is not None:
+                shard.move_to_end(session_id)
+                return session
+            
+            session = {
+                "roles": deque(maxlen=MAX_HISTORY_MESSAGES),
+                "contents": deque(maxlen=MAX_HISTORY_MESSAGES),
+                "flight_options": [],
+                "hotel_options": [],
+                "language": language
             }
+            shard[session_id] = session
+            
+            if len(shard) > MAX_SESSIONS // SESSION_SHARDS:
+                shard.popitem(last=False)
+        
+        return session
     
-    def _handle_trip_planning(self, session_id, message, language):
+    def get_conversation_history(self, session_id):
         """
-        Handle trip planning intent
+        Get a session's conversation history as message dictionaries
+        
+        Args:
+            session_id (str): Session identifier
+            
+        Returns:
+            list: Messages with role and content, oldest first
+        """
+        index = hash(session_id) & (SESSION_SHARDS - 1)
+        with self._shard_locks[index]:
+            session = self._shards[index].get(session_id)
+        if session is None:
+            return []
+        
+        return [
+            {"role": _ROLE_NAMES[role], "content": content}
+            for role, content in zip(session["roles"], session["contents"])
+        ]
+    
+    def _handle_flight_booking(self, session_id, message, language, extracted):
+        """
+        Handle flight booking intent
         
         Args:
             session_id (str): Session identifier
             message (str): User message
             language (str): Language of the conversation
+            extracted (dict): Flight, hotel and trip parameters extracted from the message
             
         Returns:
-            dict: Response with trip plan
+            dict: Response with flight options
         """
-        try:
-            # Check if we have flight and hotel options
-            flight_options = self.sessions[session_id].get("flight_options", [])
-            hotel_options = self.sessions[session_id].get("hotel_options", [])
+        if not self._has_flight_details(extracted):
+            return self._flight_info_needed(message, language)
+        
+        # Generate flight options
+        agent_response = self.flight_booking.process_request(session_id, message, language)
+        return self._flight_booking_response(session_id, language, agent_response)
+    
+    async def _ahandle_flight_booking(self, session_id, message, language, extracted):
+        """
+        Handle flight booking intent without blocking the event loop
+        
+        Args:
+            session_id (str): Session identifier
+            message (str): User message
+            language (str): Language of the conversation
+            extracted (dict): Flight, hotel and trip parameters extracted from the message
             
-            # Extract trip parameters from the message
-            params = self._extract_trip_params(message)
+        Returns:
+            dict: Response with flight options
+        """
+        if not self._has_flight_details(extracted):
+            return self._flight_info_needed(message, language)
+        
+        # Generate flight options
+        agent_response = await self.flight_booking.aprocess_request(session_id, message, language)
+        return self._flight_booking_response(session_id, language, agent_response)
+    
+    def _has_flight_details(self, extracted):
+        """Check whether the message gave everything needed to search for flights"""
+        params = extracted["flight"]
+        return bool(params["origin"] and params["destination"] and params["date"])
+    
+    def _flight_booking_response(self, session_id, language, agent_response):
+        """Store the booking agent's flight options in the session and build the reply"""
+        flight_options = agent_response.get("mock_data", {}).get("flights", [])
+        
+        # Store flight options in session
+        self._get_session(session_id, language)["flight_options"] = flight_options
+        
+        return {
+            "text": agent_response["text"],
+            "intent": "flight_booking",
+            "flight_options": flight_options
+        }
+    
+    def _flight_info_needed(self, message, language):
+        """Ask for the missing flight details through the conversation lead"""
+        lead_response = self.conversation_lead.process_message(
+            f"I need more information to book a flight. Please tell me your origin, destination, and travel date. {message}",
+            language
+        )
+        
+        return {
+            "text": lead_response["text"],
+            "intent": "flight_booking_info_needed"
+        }
+    
+    def _handle_hotel_booking(self, session_id, message, language, extracted):
+        """
+        Handle hotel booking intent
+        
+        Args:
+            session_id (str): Session identifier
+            message (str): User message
+            language (str): Language of the conversation
+            extracted (dict): Flight, hotel and trip parameters extracted from the message
             
-            # If we don't have flight or hotel options, try to extract them from the message
-            if not flight_options:
-                flight_params = self._extract_flight_params(message)
-                if flight_params["origin"] and flight_params["destination"] and flight_params["date"]:
-                    flight_response = self.flight_booking.generate_flight_options(
-                        origin=flight_params["origin"],
-                        destination=flight_params["destination"],
-                        date=flight_params["date"],
-                        passengers=flight_params["passengers"],
-                        class_type=flight_params["class_type"],
-                        language=language
-                    )
-                    flight_options = flight_response["flight_options"]
-                    self.sessions[session_id]["flight_options"] = flight_options
+        Returns:
+            dict: Response with hotel options
+        """
+        if not self._has_hotel_details(extracted):
+            return self._hotel_info_needed(message, language)
+        
+        # Generate hotel options
+        agent_response = self.hotel_booking.process_request(session_id, message, language)
+        return self._hotel_booking_response(session_id, language, agent_response)
+    
+    async def _ahandle_hotel_booking(self, session_id, message, language, extracted):
+        """
+        Handle hotel booking intent without blocking the event loop
+        
+        Args:
+            session_id (str): Session identifier
+            message (str): User message
+            language (str): Language of the conversation
+            extracted (dict): Flight, hotel and trip parameters extracted from the message
             
-            if not hotel_options:
-                hotel_params = self._extract_hotel_params(message)
-                if hotel_params["city"] and hotel_params["check_in"] and hotel_params["check_out"]:
-                    hotel_response = self.hotel_booking.generate_hotel_options(
-                        city=hotel_params["city"],
-                        check_in=hotel_params["check_in"],
-                        check_out=hotel_params["check_out"],
-                        guests=hotel_params["guests"],
-                        rooms=hotel_params["rooms"],
-                        language=language
-                    )
-                    hotel_options = hotel_response["hotel_options"]
-                    self.sessions[session_id]["hotel_options"] = hotel_options
+        Returns:
+            dict: Response with hotel options
+        """
+        if not self._has_hotel_details(extracted):
+            return self._hotel_info_needed(message, language)
+        
+        # Generate hotel options
+        agent_response = await self.hotel_booking.aprocess_request(session_id, message, language)
+        return self._hotel_booking_response(session_id, language, agent_response)
+    
+    def _has_hotel_details(self, extracted):
+        """Check whether the message gave everything needed to search for hotels"""
+        params = extracted["hotel"]
+        return bool(params["city"] and params["check_in"] and params["check_out"])
+    
+    def _hotel_booking_response(self, session_id, language, agent_response):
+        """Store the booking agent's hotel options in the session and build the reply"""
+        hotel_options = agent_response.get("mock_data", {}).get("hotels", [])
+        
+        # Store hotel options in session
+        self._get_session(session_id, language)["hotel_options"] = hotel_options
+        
+        return {
+            "text": agent_response["text"],
+            "intent": "hotel_booking",
+            "hotel_options": hotel_options
+        }
+    
+    def _hotel_info_needed(self, message, language):
+        """Ask for the missing hotel details through the conversation lead"""
+        lead_response = self.conversation_lead.process_message(
+            f"I need more information to book a hotel. Please tell me the city, check-in date, and check-out date. {message}",
+            language
+        )
+        
+        return {
+            "text": lead_response["text"],
+            "intent": "hotel_booking_info_needed"
+        }
+    
+    def _handle_trip_planning(self, session_id, message, language, extracted):
+        """
+        Handle trip planning intent
+        
+        Args:
+            session_id (str): Session identifier
+            message (str): User message
+            language (str): Language of the conversation
+            extracted (dict): Flight, hotel and trip parameters extracted from the message
             
-            # If we have enough information, generate a trip plan
-            if flight_options or hotel_options:
-                trip_response = self.trip_planning.generate_trip_plan(
-                    flight_options=flight_options,
-                    hotel_options=hotel_options,
-                    duration=params["duration"],
-                    interests=params["interests"],
-                    language=language
+        Returns:
+            dict: Response with trip plan
+        """
+        # Check if we have flight and hotel options
+        session = self._get_session(session_id, language)
+        flight_options = session.get("flight_options", [])
+        hotel_options = session.get("hotel_options", [])
+        
+        params = extracted["trip"]
+        
+        # If we don't have flight or hotel options, try to extract them from the message.
+        # Both lookups are independent DeepSeek calls, so they run side by side
+        flight_future = None
+        if not flight_options:
+            flight_params = extracted["flight"]
+            if flight_params["origin"] and flight_params["destination"] and flight_params["date"]:
+                flight_future = llm_utils.llm_executor.submit(
+                    llm_utils.generate_flight_options,
+                    origin=flight_params["origin"],
+                    destination=flight_params["destination"],
+                    departure_date=flight_params["date"]
                 )
-                
-                return {
-                    "text": trip_response["text"],
-                    "intent": "trip_planning",
-                    "trip_plan": trip_response["trip_plan"]
-                }
-            else:
-                # Not enough information, use conversation lead response
-                lead_response = self.conversation_lead.process_message(
-                    f"I need more information to plan your trip. Please tell me your destination, travel dates, and any specific interests. {message}",
-                    language
+        
+        hotel_future = None
+        if not hotel_options:
+            hotel_params = extracted["hotel"]
+            if hotel_params["city"] and hotel_params["check_in"] and hotel_params["check_out"]:
+                hotel_future = llm_utils.llm_executor.submit(
+                    llm_utils.generate_hotel_options,
+                    destination=hotel_params["city"],
+                    check_in=hotel_params["check_in"],
+                    check_out=hotel_params["check_out"]
                 )
-                
-                return {
-                    "text": lead_response["text"],
-                    "intent": "trip_planning_info_needed"
-                }
-        except Exception as e:
-            logger.error(f"Error handling trip planning: {str(e)}")
+        
+        if flight_future is not None:
+            flight_options = llm_utils.parse_options(flight_future.result(), "flights")
+            session["flight_options"] = flight_options
+        
+        if hotel_future is not None:
+            hotel_options = llm_utils.parse_options(hotel_future.result(), "hotels")
+            session["hotel_options"] = hotel_options
+        
+        # If we have enough information, generate a trip plan
+        if flight_options or hotel_options:
+            trip_response = self.trip_planning.generate_trip_plan(
+                flight_options=flight_options,
+                hotel_options=hotel_options,
+                duration=params["duration"],
+                interests=params["interests"],
+                language=language
+            )
+            
             return {
-                "text": "I'm sorry, I encountered an error processing your trip planning request.",
-                "intent": "error"
+                "text": trip_response["text"],
+                "intent": "trip_planning",
+                "trip_plan": trip_response["trip_plan"]
+            }
+        else:
+            # Not enough information, use conversation lead response
+            lead_response = self.conversation_lead.process_message(
+                f"I need more information to plan your trip. Please tell me your destination, travel dates, and any specific interests. {message}",
+                language
+            )
+            
+            return {
+                "text": lead_response["text"],
+                "intent": "trip_planning_info_needed"
             }
     
     def _extract_flight_params(self, message):
@@ -300,32 +511,25 @@ class AgentSystem:
             "class_type": "economy"
         }
         
-        # Extract origin
-        origin_match = re.search(r'from\s+([A-Za-z\s]+?)(?:\s+to|\s+on|\s+for|\s+in|\s+with|\s+\d|\s*$)', message, re.IGNORECASE)
-        if origin_match:
-            params["origin"] = origin_match.group(1).strip()
-        
-        # Extract destination
-        dest_match = re.search(r'to\s+([A-Za-z\s]+?)(?:\s+from|\s+on|\s+for|\s+in|\s+with|\s+\d|\s*$)', message, re.IGNORECASE)
-        if dest_match:
-            params["destination"] = dest_match.group(1).strip()
+        # Extract origin, destination, date and passengers in one pass; first mention wins
+        found = {}
+        for match in _FLIGHT_RE.finditer(message):
+            found.setdefault(match.lastgroup, match.group(match.lastgroup))
         
-        # Extract date
-        date_match = re.search(r'(?:on|for)\s+(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})', message, re.IGNORECASE)
-        if date_match:
-            params["date"] = date_match.group(1).strip()
+        for key in ("origin", "destination", "date"):
+            if key in found:
+                params[key] = found[key].strip()
         
-        # Extract passengers
-        passengers_match = re.search(r'(\d+)\s+(?:passenger|passengers|people|person|adult|adults)', message, re.IGNORECASE)
-        if passengers_match:
-            params["passengers"] = int(passengers_match.group(1))
+        if "passengers" in found:
+            params["passengers"] = int(found["passengers"])
         
         # Extract class
-        if re.search(r'business\s+class', message, re.IGNORECASE):
+        msg_lower = message.lower()
+        if "business class" in msg_lower:
             params["class_type"] = "business"
-        elif re.search(r'first\s+class', message, re.IGNORECASE):
+        elif "first class" in msg_lower:
             params["class_type"] = "first"
-        elif re.search(r'economy\s+class', message, re.IGNORECASE):
+        elif "economy class" in msg_lower:
             params["class_type"] = "economy"
         
         return params
@@ -350,27 +554,27 @@ class AgentSystem:
         }
         
         # Extract city
-        city_match = re.search(r'(?:in|at|to)\s+([A-Za-z\s]+?)(?:\s+from|\s+on|\s+for|\s+with|\s+\d|\s*$)', message, re.IGNORECASE)
+        city_match = _CITY_RE.search(message)
         if city_match:
             params["city"] = city_match.group(1).strip()
         
         # Extract check-in date
-        check_in_match = re.search(r'(?:from|check[\s-]in)\s+(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})', message, re.IGNORECASE)
+        check_in_match = _CHECK_IN_RE.search(message)
         if check_in_match:
             params["check_in"] = check_in_match.group(1).strip()
         
         # Extract check-out date
-        check_out_match = re.search(r'(?:to|until|check[\s-]out)\s+(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})', message, re.IGNORECASE)
+        check_out_match = _CHECK_OUT_RE.search(message)
         if check_out_match:
             params["check_out"] = check_out_match.group(1).strip()
         
         # Extract guests
-        guests_match = re.search(r'(\d+)\s+(?:guest|guests|people|person|adult|adults)', message, re.IGNORECASE)
+        guests_match = _GUESTS_RE.search(message)
         if guests_match:
             params["guests"] = int(guests_match.group(1))
         
         # Extract rooms
-        rooms_match = re.search(r'(\d+)\s+(?:room|rooms)', message, re.IGNORECASE)
+        rooms_match = _ROOMS_RE.search(message)
         if rooms_match:
             params["rooms"] = int(rooms_match.group(1))
         
@@ -393,19 +597,13 @@ class AgentSystem:
         }
         
         # Extract duration
-        duration_match = re.search(r'(\d+)\s+(?:day|days|night|nights)', message, re.IGNORECASE)
+        duration_match = _DURATION_RE.search(message)
         if duration_match:
             params["duration"] = int(duration_match.group(1))
         
-        # Extract interests (simple keyword matching)
-        interests_keywords = [
-            "history", "culture", "museum", "art", "architecture", "food", "cuisine", 
-            "shopping", "beach", "nature", "hiking", "adventure", "family", "luxury", 
-            "budget", "religious", "sightseeing", "relaxation", "sports"
-        ]
-        
-        for keyword in interests_keywords:
-            if re.search(r'\b' + keyword + r'\b', message, re.IGNORECASE):
-                params["interests"].append(keyword)
+        # Extract interests in a single pass, reported in keyword order
+        found = _INTEREST_SET.intersection(_WORD_RE.findall(message.lower()))
+        if found:
+            params["interests"] = [keyword for keyword in INTEREST_KEYWORDS if keyword in found]
         
         return params
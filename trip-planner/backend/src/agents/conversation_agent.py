@@ -2,8 +2,10 @@
 Conversation Lead Agent for Trip Planning Assistant
 Handles the main conversation flow and determines user intent
 """
+import re
 import logging
 from .llm_utils import generate_response
+from .history_utils import format_conversation_history
 from .language_utils import detect_language
 
 # Configure logging
@@ -53,21 +55,15 @@ Previous conversation: {conversation_history}
 Intent:
 """
 
-def format_conversation_history(history):
-    """
-    Format conversation history for the prompt
-    
-    Args:
-        history (list): List of message dictionaries
-        
-    Returns:
-        str: Formatted conversation history
-    """
-    formatted = ""
-    for msg in history:
-        role = "Human" if msg["role"] == "user" else "AI"
-        formatted += f"{role}: {msg['content']}\n"
-    return formatted
+# Intents the recognition prompt is allowed to return
+VALID_INTENTS = frozenset({"flight", "hotel", "trip", "continue_conversation"})
+
+# Keywords that identify an intent without asking the model
+_INTENT_KEYWORDS = (
+    ("flight", re.compile(r'\b(?:flight|flights|fly|airport|ticket|tickets)\b', re.IGNORECASE)),
+    ("hotel", re.compile(r'\b(?:hotel|hotels|room|rooms|stay|lodge)\b', re.IGNORECASE)),
+    ("trip", re.compile(r'\b(?:trip|vacation|itinerary|plan)\b', re.IGNORECASE))
+)
 
 def detect_intent(user_message, conversation_history):
     """
@@ -80,14 +76,22 @@ def detect_intent(user_message, conversation_history):
     Returns:
         str: Detected intent ("flight", "hotel", "trip", or "continue_conversation")
     """
+    # A message that mentions exactly one kind of request needs no LLM call
+    keyword_intents = [intent for intent, pattern in _INTENT_KEYWORDS if pattern.search(user_message)]
+    if len(keyword_intents) == 1:
+        logger.info("Detected intent from keywords: %s", keyword_intents[0])
+        return keyword_intents[0]
+    
     # Format conversation history for the prompt
     history_text = ""
     if conversation_history:
         history_text = format_conversation_history(conversation_history)
     
-    # Replace placeholders in the prompt
-    prompt = INTENT_RECOGNITION_PROMPT.replace("{user_input}", user_message)
-    prompt = prompt.replace("{conversation_history}", history_text)
+    # Fill in the prompt placeholders in one pass
+    prompt = INTENT_RECOGNITION_PROMPT.format_map({
+        "user_input": user_message,
+        "conversation_history": history_text
+    })
     
     # Generate response with low temperature for more deterministic output
     response = generate_response(
@@ -98,14 +102,13 @@ def detect_intent(user_message, conversation_history):
     
     # Clean and validate the response
     response = response.strip().lower()
-    valid_intents = ["flight", "hotel", "trip", "continue_conversation"]
     
-    if response in valid_intents:
-        logger.info(f"Detected intent: {response}")
+    if response in VALID_INTENTS:
+        logger.info("Detected intent: %s", response)
         return response
-    else:
-        logger.warning(f"Invalid intent detected: {response}, defaulting to continue_conversation")
-        return "continue_conversation"
+    
+    logger.warning("Invalid intent detected: %s, defaulting to continue_conversation", response)
+    return "continue_conversation"
 
 def generate_lead_response(user_message, conversation_history=None):
     """
@@ -126,9 +129,8 @@ def generate_lead_response(user_message, conversation_history=None):
     if conversation_history:
         history_text = format_conversation_history(conversation_history)
     
-    # Replace placeholders in the prompt
-    prompt = CONVERSATION_LEAD_PROMPT.replace("{history}", history_text)
-    prompt = prompt.replace("{input}", user_message)
+    # Fill in the prompt placeholders in one pass
+    prompt = CONVERSATION_LEAD_PROMPT.format_map({"history": history_text, "input": user_message})
     
     # Generate response
     response_text = generate_response(
@@ -3,7 +3,9 @@ Conversation Lead Agent for Trip Planning Assistant
 Handles main conversation flow and determines user intent
 """
 import logging
+import re
 from .langchain_utils import create_conversation_chain, run_chain_with_memory
+from .llm_utils import llm_call_slots
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -32,6 +34,17 @@ Do not make up information about real flights, hotels, or travel packages.
 Instead, indicate when you need to consult specialized agents for this information.
 """
 
+# Intent keywords in priority order; each intent is one compiled alternation.
+# Keywords must start a word ("mainstay" is not a stay) but may carry a suffix ("flights", "planning")
+_INTENT_PATTERNS = (
+    ("flight_booking", re.compile(r'\b(?:flight|fly|airplane|plane|airport|airline)')),
+    ("hotel_booking", re.compile(r'\b(?:hotel|stay|room|accommodation|lodge)')),
+    ("trip_planning", re.compile(r'\b(?:trip|travel|vacation|holiday|itinerary|plan)'))
+)
+
+# Directive prepended to Arabic turns; a fixed prefix keeps the prompt start identical across turns
+_ARABIC_CONTEXT_PREFIX = "The user is speaking in Arabic. Respond in Arabic. Original message: "
+
 class ConversationLeadAgent:
     """Conversation Lead Agent class"""
     
@@ -54,12 +67,13 @@ class ConversationLeadAgent:
         try:
             # Add language context if needed
             if language.lower() == "arabic":
-                context_message = f"The user is speaking in Arabic. Respond in Arabic. Original message: {user_message}"
+                context_message = _ARABIC_CONTEXT_PREFIX + user_message
             else:
                 context_message = user_message
             
-            # Process message through LangChain
-            response_text = run_chain_with_memory(self.chain, self.memory, context_message)
+            # Process message through LangChain, waiting for a free DeepSeek call slot
+            with llm_call_slots:
+                response_text = run_chain_with_memory(self.chain, self.memory, context_message)
             
             # Detect intent (simplified version - in a real system, this would be more sophisticated)
             intent = self._detect_intent(user_message)
@@ -88,11 +102,8 @@ class ConversationLeadAgent:
         message = message.lower()
         
         # Simple keyword-based intent detection
-        if any(word in message for word in ["flight", "fly", "plane", "airport", "airline"]):
-            return "flight_booking"
-        elif any(word in message for word in ["hotel", "stay", "room", "accommodation", "lodge"]):
-            return "hotel_booking"
-        elif any(word in message for word in ["trip", "travel", "vacation", "holiday", "itinerary", "plan"]):
-            return "trip_planning"
-        else:
-            return "general"
+        for intent, pattern in _INTENT_PATTERNS:
+            if pattern.search(message):
+                return intent
+        
+        return "general"
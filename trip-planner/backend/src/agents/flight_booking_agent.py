@@ -3,11 +3,12 @@ Flight Booking Agent for Trip Planning Assistant
 Generates fictional but realistic flight options
 """
 import logging
-import json
+import re
 import random
+from collections import namedtuple
 from datetime import datetime, timedelta
 from .langchain_utils import create_basic_chain
-from .llm_utils import LLMUtils
+from . import llm_utils
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -35,22 +36,33 @@ Important guidelines:
 Format the response in a clean, organized way that's easy for users to compare options.
 """
 
+Airline = namedtuple("Airline", "name code base_price")
+Airport = namedtuple("Airport", "city code name")
+
 # Saudi airlines
-AIRLINES = [
-    {"name": "Saudia", "code": "SV", "base_price": 800},
-    {"name": "flynas", "code": "XY", "base_price": 600},
-    {"name": "flyadeal", "code": "F3", "base_price": 500}
-]
+AIRLINES = (
+    Airline("Saudia", "SV", 800),
+    Airline("flynas", "XY", 600),
+    Airline("flyadeal", "F3", 500)
+)
 
 # Saudi cities and airports
-SAUDI_AIRPORTS = [
-    {"city": "Riyadh", "code": "RUH", "name": "King Khalid International Airport"},
-    {"city": "Jeddah", "code": "JED", "name": "King Abdulaziz International Airport"},
-    {"city": "Dammam", "code": "DMM", "name": "King Fahd International Airport"},
-    {"city": "Medina", "code": "MED", "name": "Prince Mohammad Bin Abdulaziz International Airport"},
-    {"city": "Abha", "code": "AHB", "name": "Abha International Airport"},
-    {"city": "Tabuk", "code": "TUU", "name": "Tabuk Regional Airport"}
-]
+SAUDI_AIRPORTS = (
+    Airport("Riyadh", "RUH", "King Khalid International Airport"),
+    Airport("Jeddah", "JED", "King Abdulaziz International Airport"),
+    Airport("Dammam", "DMM", "King Fahd International Airport"),
+    Airport("Medina", "MED", "Prince Mohammad Bin Abdulaziz International Airport"),
+    Airport("Abha", "AHB", "Abha International Airport"),
+    Airport("Tabuk", "TUU", "Tabuk Regional Airport")
+)
+
+# Airport lookups by lowercase city name and by IATA code
+AIRPORT_BY_CITY = {airport.city.lower(): airport for airport in SAUDI_AIRPORTS}
+AIRPORT_BY_CODE = {airport.code: airport for airport in SAUDI_AIRPORTS}
+
+# Message patterns; "to" must be a whole word so city names like "Toronto" are not split
+_TO_RE = re.compile(r"\bto\b")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
 
 class FlightBookingAgent:
     """
@@ -60,7 +72,7 @@ class FlightBookingAgent:
     
     def __init__(self):
         """Initialize the flight booking agent"""
-        self.llm_utils = LLMUtils()
+        self.llm_utils = llm_utils
         self.mock_data = {}  # Store mock data for the current session
         
     def process_request(self, session_id, message, language):
@@ -94,29 +106,142 @@ class FlightBookingAgent:
                 return_date=flight_info.get('return_date', None)
             )
             
-            if not response.get('success'):
+            return self._options_response(session_id, response, language)
+            
+        except Exception as e:
+            logger.error(f"Error in FlightBookingAgent: {str(e)}")
+            return {
+                "text": "I'm sorry, I encountered an error processing your flight request.",
+                "intent": "error",
+                "language": language
+            }
+    
+    async def aprocess_request(self, session_id, message, language):
+        """
+        Process a flight booking request without blocking the event loop
+        
+        Args:
+            session_id (str): Unique session identifier
+            message (str): User's message
+            language (str): Language of the conversation
+            
+        Returns:
+            dict: Response with flight options or error message
+        """
+        try:
+            # Extract flight information from the message
+            flight_info = self._extract_flight_info(message)
+            
+            if not flight_info:
                 return {
-                    "text": f"I'm sorry, I encountered an error generating flight options: {response.get('error', 'Unknown error')}",
+                    "text": "I'm sorry, I couldn't understand your flight request. Please provide the origin and destination cities.",
                     "intent": "error",
                     "language": language
                 }
             
-            # Store mock data for this session
-            self.mock_data[session_id] = response.get('mock_data', {})
+            # Generate mock flight options using DeepSeek
+            response = await self.llm_utils.agenerate_flight_options(
+                origin=flight_info.get('origin', ''),
+                destination=flight_info.get('destination', ''),
+                departure_date=flight_info.get('departure_date', ''),
+                return_date=flight_info.get('return_date', None)
+            )
             
-            # Format the response
-            formatted_response = self._format_flight_response(response['mock_data'], language)
+            return self._options_response(session_id, response, language)
             
+        except Exception as e:
+            logger.error(f"Error in FlightBookingAgent: {str(e)}")
             return {
-                "text": formatted_response,
+                "text": "I'm sorry, I encountered an error processing your flight request.",
+                "intent": "error",
+                "language": language
+            }
+    
+    def _options_response(self, session_id, response, language):
+        """
+        Parse a DeepSeek flight options response and build the agent's reply
+        
+        Args:
+            session_id (str): Unique session identifier
+            response (dict): Response from one of the flight option generators
+            language (str): Language of the conversation
+            
+        Returns:
+            dict: Response with flight options or error message
+        """
+        if not response.get('success'):
+            return {
+                "text": f"I'm sorry, I encountered an error generating flight options: {response.get('error', 'Unknown error')}",
+                "intent": "error",
+                "language": language
+            }
+        
+        # Parse the generated options and store them as this session's mock data
+        flights = self.llm_utils.parse_options(response, "flights")
+        mock_data = {"flights": flights} if flights else {}
+        self.mock_data[session_id] = mock_data
+        
+        # Format the response
+        formatted_response = self._format_flight_response(mock_data, language)
+        
+        return {
+            "text": formatted_response,
+            "intent": "flight_options",
+            "language": language,
+            "mock_data": mock_data  # Include raw mock data for frontend
+        }
+    
+    async def process_request_stream(self, session_id, message, language):
+        """
+        Process a flight booking request, streaming each flight as DeepSeek generates it
+        
+        Args:
+            session_id (str): Unique session identifier
+            message (str): User's message
+            language (str): Language of the conversation
+            
+        Yields:
+            dict: A "flight" event with the formatted text of each option as it
+                completes, followed by a final "done" event with the mock data
+        """
+        try:
+            flight_info = self._extract_flight_info(message)
+            
+            if not flight_info:
+                yield {
+                    "type": "done",
+                    "text": "I'm sorry, I couldn't understand your flight request. Please provide the origin and destination cities.",
+                    "intent": "error",
+                    "language": language
+                }
+                return
+            
+            yield {"type": "flight", "text": "Here are your flight options:\n\n"}
+            
+            flights = []
+            async for flight in self.llm_utils.astream_flight_options(
+                origin=flight_info.get('origin', ''),
+                destination=flight_info.get('destination', ''),
+                departure_date=flight_info.get('departure_date', ''),
+                return_date=flight_info.get('return_date', None)
+            ):
+                flights.append(flight)
+                yield {"type": "flight", "text": self._format_flight(len(flights), flight)}
+            
+            mock_data = {"flights": flights}
+            self.mock_data[session_id] = mock_data
+            
+            yield {
+                "type": "done",
                 "intent": "flight_options",
                 "language": language,
-                "mock_data": response['mock_data']  # Include raw mock data for frontend
+                "mock_data": mock_data
             }
             
         except Exception as e:
-            logger.error(f"Error in FlightBookingAgent: {str(e)}")
-            return {
+            logger.error(f"Error streaming flight options: {str(e)}")
+            yield {
+                "type": "done",
                 "text": "I'm sorry, I encountered an error processing your flight request.",
                 "intent": "error",
                 "language": language
@@ -137,18 +262,15 @@ class FlightBookingAgent:
             # This should be enhanced with a more sophisticated NLP approach
             flight_info = {}
             
-            # Look for common keywords
-            if "to" in message.lower():
-                parts = message.lower().split("to")
-                if len(parts) > 1:
-                    flight_info['destination'] = parts[1].strip()
+            # Split around the word "to"
+            parts = _TO_RE.split(message.lower())
+            if len(parts) > 1:
+                flight_info['destination'] = parts[1].strip()
                 if len(parts[0].split()) > 1:
                     flight_info['origin'] = parts[0].split()[-1].strip()
             
             # Look for dates
-            import re
-            date_pattern = r"\d{4}-\d{2}-\d{2}"
-            dates = re.findall(date_pattern, message)
+            dates = _DATE_RE.findall(message)
             if dates:
                 flight_info['departure_date'] = dates[0]
                 if len(dates) > 1:
@@ -176,20 +298,36 @@ class FlightBookingAgent:
                 return "I'm sorry, I couldn't find any flight options at the moment."
             
             flights = mock_data['flights']
-            response = "Here are your flight options:\n\n"
+            parts = ["Here are your flight options:\n\n"]
             
             for i, flight in enumerate(flights, 1):
-                response += f"Flight {i}:\n"
-                response += f"Airline: {flight.get('airline', 'Unknown')}\n"
-                response += f"Departure: {flight.get('departure_time', 'Unknown')}\n"
-                response += f"Arrival: {flight.get('arrival_time', 'Unknown')}\n"
-                response += f"Duration: {flight.get('duration', 'Unknown')}\n"
-                response += f"Price: {flight.get('price', 'Unknown')} SAR\n"
-                response += f"Seat Options: {flight.get('seat_options', {}).get('economy', 0)} Economy, {flight.get('seat_options', {}).get('business', 0)} Business\n"
-                response += "\n"
+                parts.append(self._format_flight(i, flight))
             
-            return response
+            return "".join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting flight response: {str(e)}")
             return "I'm sorry, I encountered an error formatting the flight options."
+    
+    def _format_flight(self, index, flight):
+        """
+        Format a single flight option
+        
+        Args:
+            index (int): 1-based position of the flight in the list
+            flight (dict): Flight details
+            
+        Returns:
+            str: Formatted flight text
+        """
+        seat_options = flight.get('seat_options', {})
+        return (
+            f"Flight {index}:\n"
+            f"Airline: {flight.get('airline', 'Unknown')}\n"
+            f"Departure: {flight.get('departure_time', 'Unknown')}\n"
+            f"Arrival: {flight.get('arrival_time', 'Unknown')}\n"
+            f"Duration: {flight.get('duration', 'Unknown')}\n"
+            f"Price: {flight.get('price', 'Unknown')} SAR\n"
+            f"Seat Options: {seat_options.get('economy', 0)} Economy, {seat_options.get('business', 0)} Business\n"
+            "\n"
+        )
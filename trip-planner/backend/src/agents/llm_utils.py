@@ -4,9 +4,17 @@ Handles connection to DeepSeek LLM via OpenAI compatibility layer
 """
 import os
 from dotenv import load_dotenv
+import asyncio
 import logging
 import json
-from openai import OpenAI
+import orjson
+import threading
+import weakref
+import httpx
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from openai import OpenAI, AsyncOpenAI
+from cachetools import TTLCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -23,9 +31,128 @@ if not DEEPSEEK_API_KEY:
 # DeepSeek API base URL - note the correct base URL without v1
 DEEPSEEK_API_BASE = "https://api.deepseek.com"
 
+# Set DEEPSEEK_PREWARM=0 to skip opening a DeepSeek connection at startup
+DEEPSEEK_PREWARM = os.getenv("DEEPSEEK_PREWARM", "1") != "0"
+
+# Cap on concurrent DeepSeek calls, per event loop for async callers and per process for sync ones
+MAX_CONCURRENT_LLM_CALLS = 8
+llm_call_slots = threading.BoundedSemaphore(MAX_CONCURRENT_LLM_CALLS)
+
+# Shared threads for overlapping independent sync DeepSeek calls; the workers spend
+# their time waiting on sockets with the GIL released, and llm_call_slots still applies
+llm_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm")
+
+# Connection pool limits for DeepSeek clients; idle connections are kept for a minute
+# (httpx drops them after 5s by default) so gaps between chat turns skip the TLS handshake
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+# Retries for transient DeepSeek failures (connection errors, timeouts, 408/409/429/5xx);
+# the OpenAI SDK waits with jittered exponential backoff between attempts
+LLM_MAX_RETRIES = 3
+
+# Async clients and call limits per event loop; neither can be shared across loops
+_async_clients = weakref.WeakKeyDictionary()
+_llm_semaphores = weakref.WeakKeyDictionary()
+
+# Successful option responses per prompt, so popular routes and cities skip DeepSeek
+OPTIONS_CACHE_TTL = 86400
+_options_cache = TTLCache(maxsize=1024, ttl=OPTIONS_CACHE_TTL)
+_options_cache_lock = threading.Lock()
+
+# Option system prompts are constant so every request shares the same prefix and
+# hits DeepSeek's prompt cache; the request details go in the user message
+FLIGHT_OPTIONS_SYSTEM_PROMPT = """You are a flight booking assistant for Saudi Arabia. Generate the requested number of realistic flight options for the route in the user's message.
+    For each flight, include:
+    - Airline name (Saudi airlines only)
+    - Flight number
+    - Departure time
+    - Arrival time
+    - Duration
+    - Price in SAR
+    - Booking link (mock)
+    - Seat options (economy, business)
+    
+    Return the data in JSON format with the following structure:
+    {
+        "flights": [
+            {
+                "airline": "string",
+                "flight_number": "string",
+                "departure_time": "HH:MM",
+                "arrival_time": "HH:MM",
+                "duration": "HH:MM",
+                "price": "number",
+                "booking_link": "string",
+                "seat_options": {"economy": "number", "business": "number"}
+            }
+        ]
+    }
+    """
+
+HOTEL_OPTIONS_SYSTEM_PROMPT = """You are a hotel booking assistant for Saudi Arabia. Generate the requested number of realistic hotel options in the city in the user's message.
+    For each hotel, include:
+    - Hotel name
+    - Star rating (3-5 stars)
+    - Location description
+    - Price per night in SAR
+    - Amenities (Wi-Fi, pool, etc.)
+    - Booking link (mock)
+    - Room types available
+    
+    Return the data in JSON format with the following structure:
+    {
+        "hotels": [
+            {
+                "name": "string",
+                "stars": "number",
+                "location": "string",
+                "price_per_night": "number",
+                "amenities": ["string"],
+                "booking_link": "string",
+                "room_types": {"standard": "number", "deluxe": "number", "suite": "number"}
+            }
+        ]
+    }
+    """
+
+TRIP_OPTIONS_SYSTEM_PROMPT = """You are a travel booking assistant for Saudi Arabia. Generate the requested number of realistic flight options for the route and hotel options in the destination city from the user's message.
+    For each flight, include the Saudi airline name, flight number, departure and arrival times, duration, price in SAR, a mock booking link and seat options.
+    For each hotel, include the name, star rating (3-5 stars), location description, price per night in SAR, amenities, a mock booking link and available room types.
+    
+    Return the data in JSON format with the following structure:
+    {
+        "flights": [
+            {
+                "airline": "string",
+                "flight_number": "string",
+                "departure_time": "HH:MM",
+                "arrival_time": "HH:MM",
+                "duration": "HH:MM",
+                "price": "number",
+                "booking_link": "string",
+                "seat_options": {"economy": "number", "business": "number"}
+            }
+        ],
+        "hotels": [
+            {
+                "name": "string",
+                "stars": "number",
+                "location": "string",
+                "price_per_night": "number",
+                "amenities": ["string"],
+                "booking_link": "string",
+                "room_types": {"standard": "number", "deluxe": "number", "suite": "number"}
+            }
+        ]
+    }
+    """
+
+@lru_cache(maxsize=1)
 def get_openai_client():
     """
-    Initialize and return an OpenAI client configured for DeepSeek
+    Initialize and return the shared OpenAI client configured for DeepSeek
+
+    The client is created once per process so its connection pool is reused.
 
     Returns:
         OpenAI: Configured OpenAI client for DeepSeek
@@ -33,13 +160,76 @@ def get_openai_client():
     try:
         client = OpenAI(
             api_key=DEEPSEEK_API_KEY,
-            base_url="https://api.deepseek.com"
+            base_url=DEEPSEEK_API_BASE,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=httpx.Client(limits=LLM_HTTP_LIMITS, timeout=30.0)
         )
         return client
     except Exception as e:
         logger.error(f"Error initializing OpenAI client: {str(e)}")
         raise
 
+def get_async_openai_client():
+    """
+    Get the AsyncOpenAI client for the running event loop, creating it on first use
+
+    The client speaks HTTP/2, so concurrent calls share one TLS connection.
+
+    Returns:
+        AsyncOpenAI: Async client configured for DeepSeek
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=DEEPSEEK_API_KEY,
+            base_url=DEEPSEEK_API_BASE,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=httpx.AsyncClient(http2=True, limits=LLM_HTTP_LIMITS, timeout=30.0)
+        )
+        _async_clients[loop] = client
+    return client
+
+def prewarm_connection():
+    """
+    Open a keep-alive connection to DeepSeek ahead of the first real request
+    
+    Meant to run in a background thread at startup. Failures are only logged;
+    the first request will simply connect itself.
+    """
+    if not DEEPSEEK_PREWARM:
+        return
+    
+    try:
+        get_openai_client().with_options(timeout=5).models.list()
+        logger.info("DeepSeek connection pre-warmed")
+    except Exception as e:
+        logger.warning(f"Could not pre-warm DeepSeek connection: {str(e)}")
+
+async def aprewarm_connection():
+    """
+    Open the running event loop's HTTP/2 connection to DeepSeek ahead of the first request
+    
+    Await this from an async startup hook; failures are only logged.
+    """
+    if not DEEPSEEK_PREWARM:
+        return
+    
+    try:
+        await get_async_openai_client().with_options(timeout=5).models.list()
+        logger.info("DeepSeek async connection pre-warmed")
+    except Exception as e:
+        logger.warning(f"Could not pre-warm DeepSeek async connection: {str(e)}")
+
+def _get_llm_semaphore():
+    """Get the semaphore limiting concurrent DeepSeek calls on the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+        _llm_semaphores[loop] = semaphore
+    return semaphore
+
 def generate_response(system_prompt: str, user_message: str, temperature: float = 0.7) -> dict:
     """
     Generate a response using the DeepSeek LLM
@@ -55,14 +245,52 @@ def generate_response(system_prompt: str, user_message: str, temperature: float
     try:
         client = get_openai_client()
         
-        response = client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=temperature
-        )
+        with llm_call_slots:
+            response = client.chat.completions.create(
+                model="deepseek-chat",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                temperature=temperature
+            )
+        
+        return {
+            "success": True,
+            "response": response.choices[0].message.content
+        }
+        
+    except Exception as e:
+        logger.error(f"Error generating response: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+async def agenerate_response(system_prompt: str, user_message: str, temperature: float = 0.7) -> dict:
+    """
+    Generate a response using the DeepSeek LLM without blocking the event loop
+
+    Args:
+        system_prompt (str): System prompt to set context
+        user_message (str): User's message
+        temperature (float, optional): Temperature for response generation. Defaults to 0.7.
+
+    Returns:
+        dict: Response containing success status and either the response text or error message
+    """
+    try:
+        client = get_async_openai_client()
+        
+        async with _get_llm_semaphore():
+            response = await client.chat.completions.create(
+                model="deepseek-chat",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                temperature=temperature
+            )
         
         return {
             "success": True,
@@ -76,6 +304,169 @@ def generate_response(system_prompt: str, user_message: str, temperature: float
             "error": str(e)
         }
 
+async def astream_response(system_prompt: str, user_message: str, temperature: float = 0.7):
+    """
+    Stream a DeepSeek response, yielding text as it is generated
+
+    Args:
+        system_prompt (str): System prompt to set context
+        user_message (str): User's message
+        temperature (float, optional): Temperature for response generation. Defaults to 0.7.
+
+    Yields:
+        str: Next chunk of response text
+    """
+    client = get_async_openai_client()
+    
+    async with _get_llm_semaphore():
+        stream = await client.chat.completions.create(
+            model="deepseek-chat",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            temperature=temperature,
+            stream=True
+        )
+        
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+class JsonArrayItemScanner:
+    """
+    Pull complete objects out of the first array of a JSON document as it streams in
+    
+    Lets callers act on each list entry as soon as its closing brace arrives
+    instead of waiting for the whole document.
+    """
+    
+    def __init__(self):
+        """Initialize an empty scanner"""
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._array_depth = None
+        self._item_start = None
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, chunk):
+        """
+        Add streamed text and collect the array items it completes
+        
+        Args:
+            chunk (str): Next piece of the JSON document
+            
+        Returns:
+            list: Parsed items completed by this chunk
+        """
+        self._text += chunk
+        items = []
+        
+        for i in range(self._pos, len(self._text)):
+            char = self._text[i]
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "[" and self._array_depth is None:
+                    self._array_depth = self._depth + 1
+                elif char == "{" and self._depth == self._array_depth:
+                    self._item_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if char == "}" and self._depth == self._array_depth and self._item_start is not None:
+                    try:
+                        items.append(orjson.loads(self._text[self._item_start:i + 1]))
+                    except orjson.JSONDecodeError:
+                        logger.warning("Skipping malformed item in streamed JSON")
+                    self._item_start = None
+        
+        self._pos = len(self._text)
+        return items
+
+def _get_cached_options(key):
+    """Get a cached option response, or None"""
+    with _options_cache_lock:
+        return _options_cache.get(key)
+
+def _cache_options(key, response, option_keys):
+    """Cache an option response only if every option list in it parsed"""
+    if all(parse_options(response, option_key) for option_key in option_keys):
+        with _options_cache_lock:
+            _options_cache[key] = response
+
+def _generate_options(system_prompt, user_message, option_keys):
+    """
+    Generate option data for a prompt, reusing a cached response when available
+    
+    Args:
+        system_prompt (str): Options system prompt
+        user_message (str): Options request message
+        option_keys (tuple): JSON keys of the option lists the response must contain to be cached
+        
+    Returns:
+        dict: Response containing success status and either the response text or error message
+    """
+    key = (system_prompt, user_message)
+    response = _get_cached_options(key)
+    if response is None:
+        response = generate_response(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            temperature=0.5  # Lower temperature for more consistent results
+        )
+        _cache_options(key, response, option_keys)
+    return response
+
+async def _agenerate_options(system_prompt, user_message, option_keys):
+    """
+    Async variant of _generate_options sharing the same cache
+    
+    Args:
+        system_prompt (str): Options system prompt
+        user_message (str): Options request message
+        option_keys (tuple): JSON keys of the option lists the response must contain to be cached
+        
+    Returns:
+        dict: Response containing success status and either the response text or error message
+    """
+    key = (system_prompt, user_message)
+    response = _get_cached_options(key)
+    if response is None:
+        response = await agenerate_response(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            temperature=0.5
+        )
+        _cache_options(key, response, option_keys)
+    return response
+
+def _flight_options_prompt(origin, destination, departure_date, num_options):
+    """
+    Build the system prompt and user message for a flight options request
+    
+    Args:
+        origin (str): Departure city
+        destination (str): Arrival city
+        departure_date (str): Departure date (YYYY-MM-DD)
+        num_options (int): Number of flight options to generate
+        
+    Returns:
+        tuple: (system_prompt, user_message)
+    """
+    user_message = f"Generate {num_options} flight options from {origin} to {destination} on {departure_date}"
+    return FLIGHT_OPTIONS_SYSTEM_PROMPT, user_message
+
 def generate_flight_options(origin, destination, departure_date, return_date=None, num_options=3):
     """
     Generate mock flight options using DeepSeek
@@ -90,41 +481,64 @@ def generate_flight_options(origin, destination, departure_date, return_date=Non
     Returns:
         dict: Mock flight options with detailed information
     """
-    system_prompt = f"""You are a flight booking assistant for Saudi Arabia. Generate {num_options} realistic flight options between {origin} and {destination}.
-    For each flight, include:
-    - Airline name (Saudi airlines only)
-    - Flight number
-    - Departure time
-    - Arrival time
-    - Duration
-    - Price in SAR
-    - Booking link (mock)
-    - Seat options (economy, business)
+    system_prompt, user_message = _flight_options_prompt(origin, destination, departure_date, num_options)
     
-    Return the data in JSON format with the following structure:
-    {{
-        "flights": [
-            {{
-                "airline": "string",
-                "flight_number": "string",
-                "departure_time": "HH:MM",
-                "arrival_time": "HH:MM",
-                "duration": "HH:MM",
-                "price": "number",
-                "booking_link": "string",
-                "seat_options": {{"economy": "number", "business": "number"}}
-            }}
-        ]
-    }}
+    return _generate_options(system_prompt, user_message, ("flights",))
+
+async def agenerate_flight_options(origin, destination, departure_date, return_date=None, num_options=3):
     """
+    Generate mock flight options using DeepSeek without blocking the event loop
     
-    response = generate_response(
-        system_prompt=system_prompt,
-        user_message=f"Generate flight options from {origin} to {destination} on {departure_date}",
-        temperature=0.5  # Lower temperature for more consistent results
-    )
+    Args:
+        origin (str): Departure city
+        destination (str): Arrival city
+        departure_date (str): Departure date (YYYY-MM-DD)
+        return_date (str, optional): Return date (YYYY-MM-DD)
+        num_options (int): Number of flight options to generate
+        
+    Returns:
+        dict: Mock flight options with detailed information
+    """
+    system_prompt, user_message = _flight_options_prompt(origin, destination, departure_date, num_options)
     
-    return response
+    return await _agenerate_options(system_prompt, user_message, ("flights",))
+
+async def astream_flight_options(origin, destination, departure_date, return_date=None, num_options=3):
+    """
+    Stream mock flight options from DeepSeek, yielding each flight once it is complete
+    
+    Args:
+        origin (str): Departure city
+        destination (str): Arrival city
+        departure_date (str): Departure date (YYYY-MM-DD)
+        return_date (str, optional): Return date (YYYY-MM-DD)
+        num_options (int): Number of flight options to generate
+        
+    Yields:
+        dict: Next generated flight
+    """
+    system_prompt, user_message = _flight_options_prompt(origin, destination, departure_date, num_options)
+    scanner = JsonArrayItemScanner()
+    
+    async for chunk in astream_response(system_prompt, user_message, temperature=0.5):
+        for flight in scanner.feed(chunk):
+            yield flight
+
+def _hotel_options_prompt(destination, check_in, check_out, num_options):
+    """
+    Build the system prompt and user message for a hotel options request
+    
+    Args:
+        destination (str): City name
+        check_in (str): Check-in date (YYYY-MM-DD)
+        check_out (str): Check-out date (YYYY-MM-DD)
+        num_options (int): Number of hotel options to generate
+        
+    Returns:
+        tuple: (system_prompt, user_message)
+    """
+    user_message = f"Generate {num_options} hotel options in {destination} for {check_in} to {check_out}"
+    return HOTEL_OPTIONS_SYSTEM_PROMPT, user_message
 
 def generate_hotel_options(destination, check_in, check_out, num_options=3):
     """
@@ -139,39 +553,132 @@ def generate_hotel_options(destination, check_in, check_out, num_options=3):
     Returns:
         dict: Mock hotel options with detailed information
     """
-    system_prompt = f"""You are a hotel booking assistant for Saudi Arabia. Generate {num_options} realistic hotel options in {destination}.
-    For each hotel, include:
-    - Hotel name
-    - Star rating (3-5 stars)
-    - Location description
-    - Price per night in SAR
-    - Amenities (Wi-Fi, pool, etc.)
-    - Booking link (mock)
-    - Room types available
+    system_prompt, user_message = _hotel_options_prompt(destination, check_in, check_out, num_options)
     
-    Return the data in JSON format with the following structure:
-    {{
-        "hotels": [
-            {{
-                "name": "string",
-                "stars": "number",
-                "location": "string",
-                "price_per_night": "number",
-                "amenities": ["string"],
-                "booking_link": "string",
-                "room_types": {{"standard": "number", "deluxe": "number", "suite": "number"}}
-            }}
-        ]
-    }}
+    return _generate_options(system_prompt, user_message, ("hotels",))
+
+async def agenerate_hotel_options(destination, check_in, check_out, num_options=3):
+    """
+    Generate mock hotel options using DeepSeek without blocking the event loop
+    
+    Args:
+        destination (str): City name
+        check_in (str): Check-in date (YYYY-MM-DD)
+        check_out (str): Check-out date (YYYY-MM-DD)
+        num_options (int): Number of hotel options to generate
+        
+    Returns:
+        dict: Mock hotel options with detailed information
+    """
+    system_prompt, user_message = _hotel_options_prompt(destination, check_in, check_out, num_options)
+    
+    return await _agenerate_options(system_prompt, user_message, ("hotels",))
+
+def _trip_options_prompt(origin, destination, departure_date, return_date, num_options):
     """
+    Build the system prompt and user message for a combined flight and hotel request
     
-    response = generate_response(
-        system_prompt=system_prompt,
-        user_message=f"Generate hotel options in {destination} for {check_in} to {check_out}",
-        temperature=0.5  # Lower temperature for more consistent results
+    Args:
+        origin (str): Departure city
+        destination (str): Destination city, also used for the hotel search
+        departure_date (str): Departure and check-in date (YYYY-MM-DD)
+        return_date (str): Return and check-out date (YYYY-MM-DD)
+        num_options (int): Number of flight and of hotel options to generate
+        
+    Returns:
+        tuple: (system_prompt, user_message)
+    """
+    user_message = (
+        f"Generate {num_options} flight options from {origin} to {destination} on {departure_date} "
+        f"and {num_options} hotel options in {destination} for {departure_date} to {return_date}"
     )
+    return TRIP_OPTIONS_SYSTEM_PROMPT, user_message
+
+async def agenerate_trip(origin, destination, departure_date, return_date=None, num_options=3):
+    """
+    Generate flight and hotel options for a trip
     
-    return response
+    Both lists come from one combined DeepSeek call. When one of them is already
+    cached, only the other is requested on its own.
+    
+    Args:
+        origin (str): Departure city
+        destination (str): Destination city, also used for the hotel search
+        departure_date (str): Departure and check-in date (YYYY-MM-DD)
+        return_date (str, optional): Return and check-out date (YYYY-MM-DD)
+        num_options (int): Number of flight and of hotel options to generate
+        
+    Returns:
+        dict: Flight and hotel responses under "flights" and "hotels"
+    """
+    flights = _get_cached_options(_flight_options_prompt(origin, destination, departure_date, num_options))
+    hotels = _get_cached_options(_hotel_options_prompt(destination, departure_date, return_date, num_options))
+    
+    if flights is None and hotels is None:
+        # One response carries both the "flights" and "hotels" arrays
+        system_prompt, user_message = _trip_options_prompt(origin, destination, departure_date, return_date, num_options)
+        response = await _agenerate_options(system_prompt, user_message, ("flights", "hotels"))
+        return {
+            "flights": response,
+            "hotels": response
+        }
+    
+    if flights is None:
+        flights = await agenerate_flight_options(origin, destination, departure_date, return_date, num_options)
+    if hotels is None:
+        hotels = await agenerate_hotel_options(destination, departure_date, return_date, num_options)
+    
+    return {
+        "flights": flights,
+        "hotels": hotels
+    }
+
+# Stdlib decoder used only for raw_decode, which stops at the end of the first JSON value
+_JSON_DECODER = json.JSONDecoder()
+
+def extract_json_object(text):
+    """
+    Extract the first JSON object embedded in an LLM response
+    
+    Decodes from each "{" in turn with a single C-level pass that stops where
+    the object ends, so prose or stray braces after the JSON are ignored.
+    
+    Args:
+        text (str): Response text that may contain a JSON object
+        
+    Returns:
+        dict: The first decodable JSON object, or None if there is none
+    """
+    start = text.find('{')
+    while start >= 0:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(obj, dict):
+                return obj
+        except json.JSONDecodeError:
+            pass
+        start = text.find('{', start + 1)
+    return None
+
+def parse_options(response, key):
+    """
+    Extract the option list from a DeepSeek option response
+    
+    Args:
+        response (dict): Response from one of the option generators
+        key (str): Top-level JSON key holding the options, e.g. "flights"
+        
+    Returns:
+        list: Parsed options, or an empty list if the call failed or returned no valid JSON
+    """
+    if not response.get("success"):
+        return []
+    
+    data = extract_json_object(response["response"])
+    if data is None:
+        logger.warning("Could not parse %s from DeepSeek response", key)
+        return []
+    return data.get(key, [])
 
 def test_llm_connection():
     """
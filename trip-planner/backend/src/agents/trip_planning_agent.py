@@ -2,120 +2,158 @@
 Trip Planning Agent for Trip Planning Assistant
 Combines flight and hotel information into complete travel packages
 """
+import os
 import logging
-import json
 import random
-from .langchain_utils import create_basic_chain
+from collections import namedtuple
+from functools import lru_cache
+from jinja2 import ChainableUndefined, Environment, FileSystemLoader
+from . import llm_utils
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# System prompt for the Trip Planning Agent
+# System prompt for the Trip Planning Agent; the plan layout is rendered from
+# templates/trip_plan_*.j2, so DeepSeek only writes the free-text fields
 SYSTEM_PROMPT = """
 You are the Trip Planning Agent for a Saudi-focused Trip Planning Assistant.
-Your role is to combine flight and hotel information into complete travel packages.
-
-When generating trip plans:
-1. Create coherent travel packages that combine flights and hotels
-2. Add suggestions for activities, attractions, and dining options
-3. Focus on Saudi destinations and cultural experiences
-4. Include practical travel tips specific to Saudi Arabia
-5. Organize information in a clear, day-by-day itinerary format
-6. Highlight cultural, historical, and natural attractions
+The flights, hotel, activities and travel tips of the trip plan are formatted separately.
+Write only the short free-text parts of the plan:
+- "tagline": one sentence introducing the destination
+- "day_descriptions": one or two sentences per day, in order, describing that day's activities
 
 Important guidelines:
-- Ensure the flight and hotel details align (dates, destinations)
-- Include both popular tourist sites and off-the-beaten-path experiences
-- Provide realistic time estimates for activities and transportation
-- Include cultural context and etiquette tips for Saudi Arabia
-- Support both English and Arabic responses
+- Include cultural context and etiquette tips for Saudi Arabia where relevant
 - NEVER claim these are real bookable packages - they are fictional examples
-- Include practical information about local transportation, weather, and customs
+- Write in the language requested by the user
 
-Format the response as a complete travel itinerary with clear sections for transportation,
-accommodation, daily activities, and practical tips.
+Return only JSON with the following structure:
+{"tagline": "string", "day_descriptions": ["string"]}
 """
 
-# Popular attractions by city
+# Trip plan templates, filled locally around the DeepSeek free text
+TRIP_PLAN_TEMPLATES = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates")),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    undefined=ChainableUndefined
+)
+
+Attraction = namedtuple("Attraction", "name type duration")
+Restaurant = namedtuple("Restaurant", "name cuisine price_range")
+
+# Popular attractions by city; entries are immutable, copy before reordering
 ATTRACTIONS = {
-    "Riyadh": [
-        {"name": "Kingdom Centre Tower", "type": "Modern Architecture", "duration": "2 hours"},
-        {"name": "National Museum of Saudi Arabia", "type": "Museum", "duration": "3 hours"},
-        {"name": "Diriyah", "type": "Historical Site", "duration": "4 hours"},
-        {"name": "Al Masmak Fortress", "type": "Historical Site", "duration": "2 hours"},
-        {"name": "Riyadh Zoo", "type": "Family", "duration": "3 hours"},
-        {"name": "Edge of the World", "type": "Natural", "duration": "6 hours"},
-        {"name": "King Abdullah Park", "type": "Park", "duration": "2 hours"}
-    ],
-    "Jeddah": [
-        {"name": "Al-Balad (Historic Jeddah)", "type": "Historical Site", "duration": "4 hours"},
-        {"name": "King Fahd Fountain", "type": "Landmark", "duration": "1 hour"},
-        {"name": "Jeddah Corniche", "type": "Waterfront", "duration": "3 hours"},
-        {"name": "Fakieh Aquarium", "type": "Family", "duration": "2 hours"},
-        {"name": "Floating Mosque", "type": "Religious Site", "duration": "1 hour"},
-        {"name": "Red Sea Mall", "type": "Shopping", "duration": "3 hours"}
-    ],
-    "Dammam": [
-        {"name": "King Abdulaziz Center for World Culture (Ithra)", "type": "Cultural", "duration": "4 hours"},
-        {"name": "Dammam Corniche", "type": "Waterfront", "duration": "2 hours"},
-        {"name": "Al Shatea Mall", "type": "Shopping", "duration": "3 hours"},
-        {"name": "Heritage Village", "type": "Cultural", "duration": "2 hours"},
-        {"name": "Half Moon Bay", "type": "Beach", "duration": "4 hours"}
-    ],
-    "Medina": [
-        {"name": "Al-Masjid an-Nabawi (Prophet's Mosque)", "type": "Religious Site", "duration": "3 hours"},
-        {"name": "Quba Mosque", "type": "Religious Site", "duration": "2 hours"},
-        {"name": "Al-Baqi Cemetery", "type": "Historical Site", "duration": "1 hour"},
-        {"name": "Mount Uhud", "type": "Historical Site", "duration": "3 hours"},
-        {"name": "Masjid al-Qiblatain", "type": "Religious Site", "duration": "1 hour"}
-    ],
-    "Mecca": [
-        {"name": "Masjid al-Haram (Grand Mosque)", "type": "Religious Site", "duration": "4 hours"},
-        {"name": "Jabal al-Nour", "type": "Religious Site", "duration": "3 hours"},
-        {"name": "Abraj Al-Bait (Makkah Clock Royal Tower)", "type": "Modern Architecture", "duration": "2 hours"},
-        {"name": "Makkah Museum", "type": "Museum", "duration": "2 hours"}
-    ],
-    "Taif": [
-        {"name": "Al Shafa Mountain", "type": "Natural", "duration": "4 hours"},
-        {"name": "Taif Rose Farms", "type": "Cultural", "duration": "3 hours"},
-        {"name": "Al Rudaf Park", "type": "Park", "duration": "2 hours"},
-        {"name": "Shubra Palace", "type": "Historical Site", "duration": "2 hours"},
-        {"name": "Al Hada Mountain", "type": "Natural", "duration": "3 hours"}
-    ],
-    "Abha": [
-        {"name": "Abha Palace Park", "type": "Park", "duration": "2 hours"},
-        {"name": "Green Mountain", "type": "Natural", "duration": "3 hours"},
-        {"name": "Abha Dam Lake", "type": "Natural", "duration": "2 hours"},
-        {"name": "Rijal Almaa Village", "type": "Cultural", "duration": "4 hours"},
-        {"name": "Cable Car", "type": "Activity", "duration": "2 hours"}
-    ]
+    "Riyadh": (
+        Attraction("Kingdom Centre Tower", "Modern Architecture", "2 hours"),
+        Attraction("National Museum of Saudi Arabia", "Museum", "3 hours"),
+        Attraction("Diriyah", "Historical Site", "4 hours"),
+        Attraction("Al Masmak Fortress", "Historical Site", "2 hours"),
+        Attraction("Riyadh Zoo", "Family", "3 hours"),
+        Attraction("Edge of the World", "Natural", "6 hours"),
+        Attraction("King Abdullah Park", "Park", "2 hours")
+    ),
+    "Jeddah": (
+        Attraction("Al-Balad (Historic Jeddah)", "Historical Site", "4 hours"),
+        Attraction("King Fahd Fountain", "Landmark", "1 hour"),
+        Attraction("Jeddah Corniche", "Waterfront", "3 hours"),
+        Attraction("Fakieh Aquarium", "Family", "2 hours"),
+        Attraction("Floating Mosque", "Religious Site", "1 hour"),
+        Attraction("Red Sea Mall", "Shopping", "3 hours")
+    ),
+    "Dammam": (
+        Attraction("King Abdulaziz Center for World Culture (Ithra)", "Cultural", "4 hours"),
+        Attraction("Dammam Corniche", "Waterfront", "2 hours"),
+        Attraction("Al Shatea Mall", "Shopping", "3 hours"),
+        Attraction("Heritage Village", "Cultural", "2 hours"),
+        Attraction("Half Moon Bay", "Beach", "4 hours")
+    ),
+    "Medina": (
+        Attraction("Al-Masjid an-Nabawi (Prophet's Mosque)", "Religious Site", "3 hours"),
+        Attraction("Quba Mosque", "Religious Site", "2 hours"),
+        Attraction("Al-Baqi Cemetery", "Historical Site", "1 hour"),
+        Attraction("Mount Uhud", "Historical Site", "3 hours"),
+        Attraction("Masjid al-Qiblatain", "Religious Site", "1 hour")
+    ),
+    "Mecca": (
+        Attraction("Masjid al-Haram (Grand Mosque)", "Religious Site", "4 hours"),
+        Attraction("Jabal al-Nour", "Religious Site", "3 hours"),
+        Attraction("Abraj Al-Bait (Makkah Clock Royal Tower)", "Modern Architecture", "2 hours"),
+        Attraction("Makkah Museum", "Museum", "2 hours")
+    ),
+    "Taif": (
+        Attraction("Al Shafa Mountain", "Natural", "4 hours"),
+        Attraction("Taif Rose Farms", "Cultural", "3 hours"),
+        Attraction("Al Rudaf Park", "Park", "2 hours"),
+        Attraction("Shubra Palace", "Historical Site", "2 hours"),
+        Attraction("Al Hada Mountain", "Natural", "3 hours")
+    ),
+    "Abha": (
+        Attraction("Abha Palace Park", "Park", "2 hours"),
+        Attraction("Green Mountain", "Natural", "3 hours"),
+        Attraction("Abha Dam Lake", "Natural", "2 hours"),
+        Attraction("Rijal Almaa Village", "Cultural", "4 hours"),
+        Attraction("Cable Car", "Activity", "2 hours")
+    )
 }
 
 # Restaurants by city
 RESTAURANTS = {
-    "Riyadh": [
-        {"name": "Najd Village", "cuisine": "Saudi Traditional", "price_range": "$$"},
-        {"name": "The Globe", "cuisine": "International", "price_range": "$$$"},
-        {"name": "Lusin", "cuisine": "Armenian", "price_range": "$$$"},
-        {"name": "Section-B", "cuisine": "Steakhouse", "price_range": "$$"},
-        {"name": "Takya", "cuisine": "Modern Saudi", "price_range": "$$$"}
-    ],
-    "Jeddah": [
-        {"name": "Al Nakheel", "cuisine": "Saudi Traditional", "price_range": "$$"},
-        {"name": "Twina", "cuisine": "Seafood", "price_range": "$$$"},
-        {"name": "Byblos", "cuisine": "Lebanese", "price_range": "$$"},
-        {"name": "Mataam Al Sharq", "cuisine": "Saudi Traditional", "price_range": "$$"},
-        {"name": "The Butcher Shop & Grill", "cuisine": "Steakhouse", "price_range": "$$$"}
-    ],
-    "Dammam": [
-        {"name": "Café Bateel", "cuisine": "International", "price_range": "$$"},
-        {"name": "Maharaja", "cuisine": "Indian", "price_range": "$$"},
-        {"name": "Yildizlar", "cuisine": "Turkish", "price_range": "$$"},
-        {"name": "Al Danah", "cuisine": "Seafood", "price_range": "$$$"},
-        {"name": "Zaatar w Zeit", "cuisine": "Lebanese", "price_range": "$"}
-    ]
+    "Riyadh": (
+        Restaurant("Najd Village", "Saudi Traditional", "$$"),
+        Restaurant("The Globe", "International", "$$$"),
+        Restaurant("Lusin", "Armenian", "$$$"),
+        Restaurant("Section-B", "Steakhouse", "$$"),
+        Restaurant("Takya", "Modern Saudi", "$$$")
+    ),
+    "Jeddah": (
+        Restaurant("Al Nakheel", "Saudi Traditional", "$$"),
+        Restaurant("Twina", "Seafood", "$$$"),
+        Restaurant("Byblos", "Lebanese", "$$"),
+        Restaurant("Mataam Al Sharq", "Saudi Traditional", "$$"),
+        Restaurant("The Butcher Shop & Grill", "Steakhouse", "$$$")
+    ),
+    "Dammam": (
+        Restaurant("Café Bateel", "International", "$$"),
+        Restaurant("Maharaja", "Indian", "$$"),
+        Restaurant("Yildizlar", "Turkish", "$$"),
+        Restaurant("Al Danah", "Seafood", "$$$"),
+        Restaurant("Zaatar w Zeit", "Lebanese", "$")
+    )
+}
+
+# Fallback city choices and defaults, built once instead of per itinerary
+_ATTRACTION_CITIES = tuple(ATTRACTIONS)
+_DEFAULT_CITY = "Riyadh"
+_DEFAULT_RESTAURANTS = RESTAURANTS[_DEFAULT_CITY]
+
+# Lowercased "name/type" search text per attraction, built once for interest matching
+_ATTRACTION_SEARCH = {
+    city: tuple((attraction, f"{attraction.name}\n{attraction.type}".lower()) for attraction in attractions)
+    for city, attractions in ATTRACTIONS.items()
 }
 
+@lru_cache(maxsize=64)
+def _itinerary_slots(duration, num_attractions, num_restaurants):
+    """
+    Get the morning, afternoon and dinner indices for each day of an itinerary
+    
+    Indices wrap around the attraction and restaurant lists; the plan depends
+    only on the sizes, so it is computed once per combination.
+    
+    Args:
+        duration (int): Trip duration in days
+        num_attractions (int): Number of attractions available
+        num_restaurants (int): Number of restaurants available
+        
+    Returns:
+        tuple: (morning, afternoon, restaurant) index triples, one per day
+    """
+    return tuple(
+        (day * 3 % num_attractions, (day * 3 + 1) % num_attractions, day % num_restaurants)
+        for day in range(duration)
+    )
+
 # Travel tips for Saudi Arabia
 TRAVEL_TIPS = [
     "Dress modestly in public places. Women should cover shoulders and knees, men should avoid shorts.",
@@ -137,7 +175,6 @@ class TripPlanningAgent:
     
     def __init__(self):
         """Initialize the Trip Planning Agent"""
-        self.chain = create_basic_chain(SYSTEM_PROMPT)
         logger.info("Trip Planning Agent initialized")
     
     def generate_trip_plan(self, flight_options, hotel_options, duration, interests=None, language="english"):
@@ -155,42 +192,52 @@ class TripPlanningAgent:
             dict: Response with trip plan
         """
         try:
-            # Select a flight and hotel option
-            selected_flight = flight_options[0] if flight_options else None
-            selected_hotel = hotel_options[0] if hotel_options else None
-            
-            # Generate itinerary
-            itinerary = self._generate_itinerary(selected_flight, selected_hotel, duration, interests)
-            
-            # Format the prompt for the LLM
-            prompt = f"""
-            Generate a complete trip plan based on the following information:
+            trip_plan, prompt = self._prepare_trip_plan(flight_options, hotel_options, duration, interests, language)
             
-            Flight: {json.dumps(selected_flight, indent=2) if selected_flight else "No flight information provided"}
+            # DeepSeek only writes the free-text fields of the plan
+            response = llm_utils.generate_response(SYSTEM_PROMPT, prompt)
             
-            Hotel: {json.dumps(selected_hotel, indent=2) if selected_hotel else "No hotel information provided"}
-            
-            Itinerary: {json.dumps(itinerary, indent=2)}
-            
-            Duration: {duration} days
-            
-            Interests: {', '.join(interests) if interests else "General tourism"}
+            return {
+                "text": self._render_trip_plan(trip_plan, duration, language, response),
+                "trip_plan": trip_plan
+            }
+        except Exception as e:
+            logger.error(f"Error in Trip Planning Agent: {str(e)}")
+            return {
+                "text": "I'm sorry, I encountered an error generating a trip plan.",
+                "trip_plan": {}
+            }
+    
+    async def agenerate_trip_plan(self, origin, destination, departure_date, return_date, duration, interests=None, language="english"):
+        """
+        Generate flight and hotel options in one DeepSeek call, then build a trip plan from them
+        
+        Args:
+            origin (str): Departure city
+            destination (str): Destination city
+            departure_date (str): Departure and check-in date (YYYY-MM-DD)
+            return_date (str): Return and check-out date (YYYY-MM-DD)
+            duration (int): Trip duration in days
+            interests (list): User interests (optional)
+            language (str): Language for the response (english, arabic)
             
-            Include practical travel tips specific to Saudi Arabia.
+        Returns:
+            dict: Response with trip plan
+        """
+        try:
+            # One combined DeepSeek call returns both option lists
+            options = await llm_utils.agenerate_trip(origin, destination, departure_date, return_date)
+            flight_options = llm_utils.parse_options(options["flights"], "flights")
+            hotel_options = llm_utils.parse_options(options["hotels"], "hotels")
             
-            Respond in {language}.
-            """
+            trip_plan, prompt = self._prepare_trip_plan(flight_options, hotel_options, duration, interests, language)
             
-            # Process through LangChain
-            response_text = self.chain.invoke({"input": prompt})
+            # DeepSeek only writes the free-text fields of the plan
+            response = await llm_utils.agenerate_response(SYSTEM_PROMPT, prompt)
             
             return {
-                "text": response_text,
-                "trip_plan": {
-                    "flight": selected_flight,
-                    "hotel": selected_hotel,
-                    "itinerary": itinerary
-                }
+                "text": self._render_trip_plan(trip_plan, duration, language, response),
+                "trip_plan": trip_plan
             }
         except Exception as e:
             logger.error(f"Error in Trip Planning Agent: {str(e)}")
@@ -199,6 +246,79 @@ class TripPlanningAgent:
                 "trip_plan": {}
             }
     
+    def _prepare_trip_plan(self, flight_options, hotel_options, duration, interests, language):
+        """
+        Select options, build the itinerary and format the free-text prompt
+        
+        Args:
+            flight_options (list): List of flight options
+            hotel_options (list): List of hotel options
+            duration (int): Trip duration in days
+            interests (list): User interests (optional)
+            language (str): Language for the response (english, arabic)
+            
+        Returns:
+            tuple: (trip_plan, prompt)
+        """
+        # Select a flight and hotel option
+        selected_flight = flight_options[0] if flight_options else None
+        selected_hotel = hotel_options[0] if hotel_options else None
+        
+        # Generate itinerary
+        itinerary = self._generate_itinerary(selected_flight, selected_hotel, duration, interests)
+        
+        # Only compact one-line day outlines are sent; the full details are filled in
+        # by the template. Lines carry no indentation, which DeepSeek would bill as tokens
+        day_outlines = "\n".join(
+            f"Day {day['day']}: " + " | ".join(activity["activity"] for activity in day["activities"])
+            for day in itinerary["days"]
+        )
+        prompt = (
+            f"Destination: {itinerary['destination']}\n"
+            f"Duration: {duration} days\n"
+            f"Interests: {', '.join(interests) if interests else 'General tourism'}\n"
+            f"Daily activities:\n{day_outlines}\n"
+            f"Respond in {language}."
+        )
+        
+        trip_plan = {
+            "flight": selected_flight,
+            "hotel": selected_hotel,
+            "itinerary": itinerary
+        }
+        return trip_plan, prompt
+    
+    def _render_trip_plan(self, trip_plan, duration, language, response):
+        """
+        Render the trip plan template around the DeepSeek free text
+        
+        Args:
+            trip_plan (dict): Selected flight, hotel and itinerary
+            duration (int): Trip duration in days
+            language (str): Language for the response (english, arabic)
+            response (dict): DeepSeek response holding the tagline and day descriptions
+            
+        Returns:
+            str: Formatted trip plan
+        """
+        free_text = None
+        if response.get("success"):
+            free_text = llm_utils.extract_json_object(response["response"])
+        if free_text is None:
+            # Still render the plan, just without the generated blurbs
+            logger.warning("Could not parse trip plan text from DeepSeek response")
+            free_text = {}
+        
+        template_name = "trip_plan_ar.j2" if language == "arabic" else "trip_plan_en.j2"
+        return TRIP_PLAN_TEMPLATES.get_template(template_name).render(
+            flight=trip_plan["flight"],
+            hotel=trip_plan["hotel"],
+            itinerary=trip_plan["itinerary"],
+            duration=duration,
+            tagline=free_text.get("tagline", ""),
+            day_descriptions=free_text.get("day_descriptions") or []
+        )
+    
     def _generate_itinerary(self, flight, hotel, duration, interests=None):
         """
         Generate a day-by-day itinerary
@@ -218,68 +338,70 @@ class TripPlanningAgent:
         elif hotel and "location" in hotel:
             city = hotel["location"].split()[-1]  # Extract city from location
         else:
-            city = random.choice(list(ATTRACTIONS.keys()))
+            city = random.choice(_ATTRACTION_CITIES)
         
         # Get attractions for the city or use Riyadh as default
-        city_attractions = ATTRACTIONS.get(city, ATTRACTIONS["Riyadh"])
+        attractions_city = city if city in ATTRACTIONS else _DEFAULT_CITY
+        city_attractions = ATTRACTIONS[attractions_city]
         
         # Get restaurants for the city or use Riyadh as default
-        city_restaurants = RESTAURANTS.get(city, RESTAURANTS["Riyadh"])
+        city_restaurants = RESTAURANTS.get(city, _DEFAULT_RESTAURANTS)
         
         # Filter attractions based on interests if provided
         if interests:
-            # Simple keyword matching for interests
-            filtered_attractions = []
-            for attraction in city_attractions:
-                if any(interest.lower() in attraction["name"].lower() or 
-                       interest.lower() in attraction["type"].lower() 
-                       for interest in interests):
-                    filtered_attractions.append(attraction)
+            # Simple keyword matching for interests against the precomputed lowercase text
+            lowered_interests = [interest.lower() for interest in interests]
+            filtered_attractions = [
+                attraction for attraction, text in _ATTRACTION_SEARCH[attractions_city]
+                if any(interest in text for interest in lowered_interests)
+            ]
             
             # If we have enough filtered attractions, use them
             if len(filtered_attractions) >= duration * 2:
                 city_attractions = filtered_attractions
         
-        # Shuffle attractions and restaurants for variety
-        random.shuffle(city_attractions)
-        random.shuffle(city_restaurants)
+        # Shuffle attractions and restaurants for variety; random.sample returns
+        # shuffled copies, leaving the shared tables untouched
+        city_attractions = random.sample(city_attractions, len(city_attractions))
+        city_restaurants = random.sample(city_restaurants, len(city_restaurants))
         
         # Select travel tips
         selected_tips = random.sample(TRAVEL_TIPS, min(4, len(TRAVEL_TIPS)))
         
-        # Generate daily itinerary
+        # Generate daily itinerary from the precomputed per-day indices
+        slots = _itinerary_slots(duration, len(city_attractions), len(city_restaurants))
         days = []
-        for day in range(1, duration + 1):
+        for day, (morning_index, afternoon_index, restaurant_index) in enumerate(slots, 1):
             # For first day, include arrival if flight is provided
             if day == 1 and flight:
                 morning_activity = {
                     "time": "Morning",
                     "activity": f"Arrival at {flight['destination']['airport']} ({flight['destination']['code']})",
-                    "description": f"Arrive on flight {flight['flight_number']} at {flight['arrival'].split()[1]}. Transfer to hotel and check-in."
+                    "description": f"Arrive on flight {flight['flight_number']} at {flight['arrival'].rpartition(' ')[2]}. Transfer to hotel and check-in."
                 }
             else:
                 # Get a morning attraction
-                attraction_index = (day - 1) * 3 % len(city_attractions)
+                attraction = city_attractions[morning_index]
                 morning_activity = {
                     "time": "Morning",
-                    "activity": city_attractions[attraction_index]["name"],
-                    "description": f"Visit {city_attractions[attraction_index]['name']} ({city_attractions[attraction_index]['type']}). Estimated duration: {city_attractions[attraction_index]['duration']}."
+                    "activity": attraction.name,
+                    "description": f"Visit {attraction.name} ({attraction.type}). Estimated duration: {attraction.duration}."
                 }
             
             # Get an afternoon attraction
-            attraction_index = (day - 1) * 3 + 1 % len(city_attractions)
+            attraction = city_attractions[afternoon_index]
             afternoon_activity = {
                 "time": "Afternoon",
-                "activity": city_attractions[attraction_index]["name"],
-                "description": f"Explore {city_attractions[attraction_index]['name']} ({city_attractions[attraction_index]['type']}). Estimated duration: {city_attractions[attraction_index]['duration']}."
+                "activity": attraction.name,
+                "description": f"Explore {attraction.name} ({attraction.type}). Estimated duration: {attraction.duration}."
             }
             
             # Get a restaurant for dinner
-            restaurant_index = (day - 1) % len(city_restaurants)
+            restaurant = city_restaurants[restaurant_index]
             evening_activity = {
                 "time": "Evening",
-                "activity": f"Dinner at {city_restaurants[restaurant_index]['name']}",
-                "description": f"Enjoy {city_restaurants[restaurant_index]['cuisine']} cuisine at {city_restaurants[restaurant_index]['name']} (Price range: {city_restaurants[restaurant_index]['price_range']})."
+                "activity": f"Dinner at {restaurant.name}",
+                "description": f"Enjoy {restaurant.cuisine} cuisine at {restaurant.name} (Price range: {restaurant.price_range})."
             }
             
             # For last day, include departure if flight is provided
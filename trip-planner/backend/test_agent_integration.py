@@ -4,7 +4,7 @@ with mock data instead of API calls
 """
 import os
 import logging
-import json
+from concurrent.futures import ThreadPoolExecutor
 from agents.conversation_lead_agent import ConversationLeadAgent
 from agents.flight_booking_agent import FlightBookingAgent
 from agents.hotel_booking_agent import HotelBookingAgent
@@ -14,14 +14,14 @@ from agents.trip_planning_agent import TripPlanningAgent
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Agents shared by every test
+conversation_agent = ConversationLeadAgent()
+flight_agent = FlightBookingAgent()
+hotel_agent = HotelBookingAgent()
+trip_agent = TripPlanningAgent()
+
 def test_conversation_flow():
     """Test the conversation flow through different agent interactions"""
-    # Initialize agents
-    conversation_agent = ConversationLeadAgent()
-    flight_agent = FlightBookingAgent()
-    hotel_agent = HotelBookingAgent()
-    trip_agent = TripPlanningAgent()
-    
     # Test session ID
     session_id = "test_session_123"
     
@@ -99,47 +99,57 @@ def test_direct_agents():
     
     print("\n===== TESTING DIRECT AGENT CALLS =====")
     
+    # The three agents are independent, so their requests run side by side
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        flight_future = executor.submit(
+            flight_agent.process_request,
+            session_id,
+            "I need a flight from Riyadh to Jeddah",
+            "english"
+        )
+        hotel_future = executor.submit(
+            hotel_agent.process_request,
+            session_id,
+            "I need a hotel in Riyadh",
+            "english"
+        )
+        trip_future = executor.submit(
+            trip_agent.process_request,
+            session_id,
+            "I want to plan a trip from Jeddah to Riyadh",
+            "english"
+        )
+        flight_response = flight_future.result()
+        hotel_response = hotel_future.result()
+        trip_response = trip_future.result()
+    
     # Test FlightBookingAgent directly
     print("\n1. Flight Booking Agent Test:")
-    flight_agent = FlightBookingAgent()
-    flight_response = flight_agent.process_request(
-        session_id, 
-        "I need a flight from Riyadh to Jeddah", 
-        "english"
-    )
     print(flight_response['text'])
     mock_flights = flight_response.get('mock_data', {}).get('flights', [])
     print(f"Generated {len(mock_flights)} flight options")
     if mock_flights:
-        print(f"Sample flight: {json.dumps(mock_flights[0], indent=2)}")
+        flight = mock_flights[0]
+        print(f"Sample flight: {flight.get('airline')} {flight.get('flight_number')} "
+              f"{flight.get('departure_time')} -> {flight.get('arrival_time')} {flight.get('price')}")
     
     # Test HotelBookingAgent directly
     print("\n2. Hotel Booking Agent Test:")
-    hotel_agent = HotelBookingAgent()
-    hotel_response = hotel_agent.process_request(
-        session_id, 
-        "I need a hotel in Riyadh", 
-        "english"
-    )
     print(hotel_response['text'])
     mock_hotels = hotel_response.get('mock_data', {}).get('hotels', [])
     print(f"Generated {len(mock_hotels)} hotel options")
     if mock_hotels:
-        print(f"Sample hotel: {json.dumps(mock_hotels[0], indent=2)}")
+        hotel = mock_hotels[0]
+        print(f"Sample hotel: {hotel.get('name')} ({hotel.get('star_rating')} stars) {hotel.get('price')}")
     
     # Test TripPlanningAgent directly
     print("\n3. Trip Planning Agent Test:")
-    trip_agent = TripPlanningAgent()
-    trip_response = trip_agent.process_request(
-        session_id, 
-        "I want to plan a trip from Jeddah to Riyadh", 
-        "english"
-    )
     print(trip_response['text'])
     mock_packages = trip_response.get('mock_data', {}).get('trip_packages', [])
     print(f"Generated {len(mock_packages)} trip packages")
     if mock_packages:
-        print(f"Sample package summary: {json.dumps({'package_id': mock_packages[0]['package_id'], 'name': mock_packages[0]['name'], 'total_price': mock_packages[0]['total_price']}, indent=2)}")
+        package = mock_packages[0]
+        print(f"Sample package summary: {package.get('name')} - {package.get('total_price')} {package.get('currency')}")
 
 if __name__ == "__main__":
     print("Starting Trip Planning Assistant Integration Tests")
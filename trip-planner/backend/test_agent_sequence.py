@@ -18,6 +18,12 @@ from agents.flight_booking_agent import FlightBookingAgent
 from agents.hotel_booking_agent import HotelBookingAgent
 from agents.trip_planning_agent import TripPlanningAgent
 
+# Agents shared by every test
+conversation_agent = ConversationLeadAgent()
+flight_agent = FlightBookingAgent()
+hotel_agent = HotelBookingAgent()
+trip_agent = TripPlanningAgent()
+
 def process_conversation(message: str, language: str = "english"):
     """
     Process a conversation through the appropriate sequence of agents
@@ -33,12 +39,6 @@ def process_conversation(message: str, language: str = "english"):
     # Generate a unique session ID
     session_id = f"test_{uuid.uuid4().hex[:8]}"
     
-    # Initialize all agents
-    conversation_agent = ConversationLeadAgent()
-    flight_agent = FlightBookingAgent()
-    hotel_agent = HotelBookingAgent()
-    trip_agent = TripPlanningAgent()
-    
     # Step 1: Let conversation lead agent determine intent
     logger.info(f"Step 1: Processing with ConversationLeadAgent")
     convo_result = conversation_agent.process_request(session_id, message, language)
@@ -18,10 +18,14 @@ load_dotenv()
 class TestAgentSystem(unittest.TestCase):
     """Test class for Agent System integration"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one agent system shared by all tests"""
+        cls.agent_system = AgentSystem()
+    
     def setUp(self):
         """Set up test environment"""
         self.session_id = "test_session_" + str(os.urandom(4).hex())
-        self.agent_system = AgentSystem()
     
     def test_conversation_flow(self):
         """Test basic conversation flow"""
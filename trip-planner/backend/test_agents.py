@@ -18,13 +18,14 @@ if not DEEPSEEK_API_KEY:
     print("Make sure you have a .env file with DEEPSEEK_API_KEY=your_api_key")
     sys.exit(1)
 
-def test_conversation_lead():
+def test_conversation_lead(agent_system=None):
     """Test the Conversation Lead Agent"""
     print("\n--- Testing Conversation Lead Agent ---")
     
     try:
-        # Initialize agent system
-        agent_system = AgentSystem()
+        # Use the caller's agent system, or create one when run on its own
+        if agent_system is None:
+            agent_system = AgentSystem()
         
         # Generate a session ID
         session_id = str(uuid.uuid4())
@@ -48,13 +49,14 @@ def test_conversation_lead():
         print(f"\nError testing Conversation Lead Agent: {str(e)}")
         return False
 
-def test_flight_booking():
+def test_flight_booking(agent_system=None):
     """Test the Flight Booking Agent"""
     print("\n--- Testing Flight Booking Agent ---")
     
     try:
-        # Initialize agent system
-        agent_system = AgentSystem()
+        # Use the caller's agent system, or create one when run on its own
+        if agent_system is None:
+            agent_system = AgentSystem()
         
         # Generate a session ID
         session_id = str(uuid.uuid4())
@@ -78,13 +80,14 @@ def test_flight_booking():
         print(f"\nError testing Flight Booking Agent: {str(e)}")
         return False
 
-def test_hotel_booking():
+def test_hotel_booking(agent_system=None):
     """Test the Hotel Booking Agent"""
     print("\n--- Testing Hotel Booking Agent ---")
     
     try:
-        # Initialize agent system
-        agent_system = AgentSystem()
+        # Use the caller's agent system, or create one when run on its own
+        if agent_system is None:
+            agent_system = AgentSystem()
         
         # Generate a session ID
         session_id = str(uuid.uuid4())
@@ -108,13 +111,14 @@ def test_hotel_booking():
         print(f"\nError testing Hotel Booking Agent: {str(e)}")
         return False
 
-def test_trip_planning():
+def test_trip_planning(agent_system=None):
     """Test the Trip Planning Agent"""
     print("\n--- Testing Trip Planning Agent ---")
     
     try:
-        # Initialize agent system
-        agent_system = AgentSystem()
+        # Use the caller's agent system, or create one when run on its own
+        if agent_system is None:
+            agent_system = AgentSystem()
         
         # Generate a session ID
         session_id = str(uuid.uuid4())
@@ -152,13 +156,14 @@ def test_trip_planning():
         print(f"\nError testing Trip Planning Agent: {str(e)}")
         return False
 
-def test_arabic_support():
+def test_arabic_support(agent_system=None):
     """Test Arabic language support"""
     print("\n--- Testing Arabic Language Support ---")
     
     try:
-        # Initialize agent system
-        agent_system = AgentSystem()
+        # Use the caller's agent system, or create one when run on its own
+        if agent_system is None:
+            agent_system = AgentSystem()
         
         # Generate a session ID
         session_id = str(uuid.uuid4())
@@ -187,12 +192,13 @@ def main():
     """Main function to run tests"""
     print("=== Agent System Integration Test ===")
     
-    # Run tests
-    lead_success = test_conversation_lead()
-    flight_success = test_flight_booking()
-    hotel_success = test_hotel_booking()
-    trip_success = test_trip_planning()
-    arabic_success = test_arabic_support()
+    # Run tests against one shared agent system
+    agent_system = AgentSystem()
+    lead_success = test_conversation_lead(agent_system)
+    flight_success = test_flight_booking(agent_system)
+    hotel_success = test_hotel_booking(agent_system)
+    trip_success = test_trip_planning(agent_system)
+    arabic_success = test_arabic_support(agent_system)
     
     # Print summary
     print("\n=== Test Summary ===")
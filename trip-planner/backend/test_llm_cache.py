@@ -0,0 +1,61 @@
+"""
+Test script for Trip Planning Assistant LLM response cache
+"""
+import unittest
+from unittest import mock
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from agents.llm_cache import LLMCache, create_llm_cache
+
+class TestLLMCache(unittest.TestCase):
+    """Test cases for the in-memory LLM response cache"""
+
+    def test_cache_key_is_stable(self):
+        """Equal requests map to the same key, different ones do not"""
+        messages = [{"role": "user", "content": "Flights to Jeddah"}]
+        key = LLMCache.cache_key("deepseek-chat", messages, 0)
+
+        self.assertEqual(key, LLMCache.cache_key("deepseek-chat", list(messages), 0))
+        self.assertNotEqual(key, LLMCache.cache_key("deepseek-chat", messages, 0.7))
+        self.assertNotEqual(key, LLMCache.cache_key("deepseek-reasoner", messages, 0))
+        self.assertNotEqual(key, LLMCache.cache_key("deepseek-chat", messages, 0, max_tokens=350))
+        self.assertNotEqual(key, LLMCache.cache_key("deepseek-chat", messages, 0, json_mode=True))
+
+    def test_get_and_set(self):
+        """Stored values are returned until they are evicted"""
+        cache = LLMCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Touch "a" so "b" becomes the least recently used entry
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_expiry(self):
+        """Entries older than the ttl are treated as missing"""
+        cache = LLMCache(ttl=10)
+        with mock.patch("agents.llm_cache.time.monotonic", return_value=100):
+            cache.set("a", 1)
+        with mock.patch("agents.llm_cache.time.monotonic", return_value=105):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("agents.llm_cache.time.monotonic", return_value=111):
+            self.assertIsNone(cache.get("a"))
+
+    def test_create_llm_cache_without_redis(self):
+        """Without a Redis client the factory falls back to the in-process cache"""
+        with mock.patch("agents.llm_cache.get_redis_client", return_value=None):
+            cache = create_llm_cache("llm:test", maxsize=4, ttl=60)
+
+        self.assertIsInstance(cache, LLMCache)
+        self.assertEqual(cache.maxsize, 4)
+        self.assertEqual(cache.ttl, 60)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,25 @@
 """
 WSGI entry point for the Trip Planning Assistant application
+
+Production deployments should serve this module with gunicorn, e.g.:
+    gunicorn -c gunicorn.conf.py wsgi:app
+Running this file directly does the same unless --debug is passed.
 """
+import os
+import sys
+import subprocess
+
 from app_factory import create_app
 
 # Create the application
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5003, debug=True)
+    if '--debug' in sys.argv or os.getenv('FLASK_ENV') == 'development':
+        # Development server with reloader and debugger
+        app.run(host='0.0.0.0', port=5003, debug=True)
+    else:
+        # Serve through gunicorn with gevent workers
+        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+        sys.exit(subprocess.run(['gunicorn', '-c', config_path, 'wsgi:app'],
+                                cwd=os.path.dirname(config_path)).returncode)